@@ -5,11 +5,22 @@ Abstract Base Class für LLM Provider
 Definiert das Interface für alle Provider (Ollama, Groq, OpenAI, etc.)
 """
 
+import asyncio
+import hashlib
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any, Tuple, Union
+
+import orjson
 from pydantic import BaseModel
 
 
+DEFAULT_BATCH_CONCURRENCY = 8
+RESPONSE_CACHE_SIZE = 256
+
+
 class ProviderConfig(BaseModel):
     """Provider-Konfiguration"""
     name: str
@@ -35,10 +46,15 @@ class ModelInfo(BaseModel):
     is_default: bool
     capabilities: List[str]
     metadata: Dict[str, str]
+    # Beim Laden aus metadata["cost"] geparst (nicht pro Request)
+    input_cost_per_1k: float = 0.0
+    output_cost_per_1k: float = 0.0
+    is_free: bool = False
 
 
-class ChatMessage(BaseModel):
-    """Chat-Nachricht"""
+@dataclass(slots=True)
+class ChatMessage:
+    """Chat-Nachricht (schlanke Dataclass, orjson serialisiert sie direkt in den Payload)"""
     role: str  # "system", "user", "assistant"
     content: str
 
@@ -77,6 +93,17 @@ class AbstractLLMProvider(ABC):
         self.config = config
         self.name = config.name
         self.type = config.type
+        # Statischer Model-Katalog: einmal gebaut, danach wiederverwendet
+        self._models_cache: Optional[List[ModelInfo]] = None
+        # model_id -> ModelInfo, beim ersten get_model_info() gebaut (None = noch nicht gebaut)
+        self._models_by_id: Optional[Dict[str, ModelInfo]] = None
+        # Health-Cache: (Ergebnis, Zeitpunkt) – stale-while-revalidate
+        self._health_cache: Tuple[bool, float] = (False, 0.0)
+        self._health_ttl = 30.0
+        self._health_refresh: Optional[asyncio.Task] = None
+        # LRU-Cache für deterministische Antworten + laufende identische Requests
+        self._response_cache: "OrderedDict[str, ChatResponse]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
         
     @abstractmethod
     async def chat(
@@ -105,6 +132,72 @@ class AbstractLLMProvider(ABC):
         """
         pass
     
+    async def _cached_response(
+        self,
+        payload: dict,
+        fetch: Callable[[], Awaitable[ChatResponse]]
+    ) -> ChatResponse:
+        """
+        Liefert eine Antwort aus dem LRU-Cache oder führt fetch() aus
+        
+        Gleichzeitige identische Requests teilen sich einen laufenden Task
+        (Request Coalescing). Nur für deterministische Anfragen verwenden.
+        
+        Args:
+            payload: Vollständiger Request-Payload (bildet den Cache-Key)
+            fetch: Coroutine-Factory, die den echten Request ausführt
+            
+        Returns:
+            Kopie der (gecachten) ChatResponse
+        """
+        key = hashlib.blake2b(orjson.dumps(payload), digest_size=16).hexdigest()
+        
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            self._response_cache.move_to_end(key)
+            response = cached.model_copy(deep=True)
+            response.metadata = {**(response.metadata or {}), "cache_hit": True}
+            return response
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._store_response(key, t))
+        
+        # shield: Abbruch eines Aufrufers beendet nicht den Request der anderen
+        response = await asyncio.shield(task)
+        return response.model_copy(deep=True)
+    
+    def _store_response(self, key: str, task: asyncio.Task) -> None:
+        """Done-Callback: Ergebnis eines fetch()-Tasks in den LRU-Cache übernehmen"""
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._response_cache[key] = task.result()
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+    
+    async def chat_stream(
+        self,
+        messages: List[ChatMessage],
+        model: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Streamt die Antwort stückweise (Text-Deltas)
+        
+        Default: ein einziger Chunk aus chat(). Provider mit nativem
+        Streaming überschreiben diese Methode.
+        
+        Yields:
+            Inkrementelle Text-Fragmente der Antwort
+        """
+        response = await self.chat(messages, model, temperature=temperature, max_tokens=max_tokens, **kwargs)
+        yield response.content
+    
     @abstractmethod
     async def validate(self, api_key: Optional[str] = None) -> ProviderValidationResult:
         """
@@ -129,14 +222,77 @@ class AbstractLLMProvider(ABC):
         pass
     
     @abstractmethod
+    async def _check_health(self) -> bool:
+        """
+        Führt den eigentlichen (möglichst günstigen) Health-Check aus
+        
+        Returns:
+            True wenn gesund, False bei Problemen
+        """
+        pass
+    
     async def is_healthy(self) -> bool:
         """
         Prüft ob Provider erreichbar und funktional ist
         
+        Ergebnisse werden für _health_ttl Sekunden gecacht. Danach wird bis
+        zur doppelten TTL der alte Wert geliefert und im Hintergrund erneuert,
+        erst älter als das wird synchron geprüft.
+        
         Returns:
             True wenn gesund, False bei Problemen
         """
-        pass
+        healthy, checked_at = self._health_cache
+        age = time.monotonic() - checked_at
+        if checked_at and age < self._health_ttl:
+            return healthy
+        
+        if checked_at and age < 2 * self._health_ttl:
+            if self._health_refresh is None or self._health_refresh.done():
+                self._health_refresh = asyncio.create_task(self._refresh_health())
+            return healthy
+        
+        return await self._refresh_health()
+    
+    async def _refresh_health(self) -> bool:
+        """Führt _check_health aus und aktualisiert den Cache"""
+        try:
+            healthy = await self._check_health()
+        except Exception:
+            healthy = False
+        self._health_cache = (healthy, time.monotonic())
+        return healthy
+    
+    async def chat_many(
+        self,
+        requests: List[Dict[str, Any]],
+        concurrency: Optional[int] = None
+    ) -> List[Union[ChatResponse, Exception]]:
+        """
+        Sendet mehrere Chat-Anfragen nebenläufig (begrenzt per Semaphore)
+        
+        Args:
+            requests: Liste von chat()-Argumenten, z.B. {"messages": [...], "model": "..."}
+            concurrency: Max. gleichzeitige Requests (None = aus rate_limits ableiten)
+            
+        Returns:
+            Ergebnisse in Eingabe-Reihenfolge; fehlgeschlagene Requests als Exception
+        """
+        semaphore = asyncio.Semaphore(concurrency or self._batch_concurrency())
+        
+        async def run(request: Dict[str, Any]) -> ChatResponse:
+            async with semaphore:
+                return await self.chat(**request)
+        
+        return await asyncio.gather(*(run(r) for r in requests), return_exceptions=True)
+    
+    def _batch_concurrency(self) -> int:
+        """Parallelität für chat_many: explizit konfiguriert oder max. RPM, gedeckelt"""
+        limits = self.config.rate_limits
+        if limits.get("max_concurrent_requests"):
+            return limits["max_concurrent_requests"]
+        rpm = limits.get("requests_per_minute")
+        return min(rpm, DEFAULT_BATCH_CONCURRENCY) if rpm else DEFAULT_BATCH_CONCURRENCY
     
     def get_model_info(self, model_id: str) -> Optional[ModelInfo]:
         """
@@ -148,11 +304,9 @@ class AbstractLLMProvider(ABC):
         Returns:
             ModelInfo oder None wenn nicht gefunden
         """
-        models = self.get_models()
-        for model in models:
-            if model.model_id == model_id:
-                return model
-        return None
+        if self._models_by_id is None:
+            self._models_by_id = {model.model_id: model for model in self.get_models()}
+        return self._models_by_id.get(model_id)
     
     def supports_streaming(self) -> bool:
         """Gibt zurück ob Provider Streaming unterstützt"""
@@ -0,0 +1,49 @@
+"""
+catalog.py
+
+Provider- und Model-Katalog (providers_kiff.json / models_kiff.json)
+- Wird einmal pro Prozess mit orjson geparst und von allen Providern geteilt
+- Pfade per ENV überschreibbar (KIFF_PROVIDERS_JSON, KIFF_MODELS_JSON)
+- Rückgabewerte sind geteilte Objekte und dürfen nicht verändert werden
+"""
+
+import functools
+import os
+from pathlib import Path
+
+import orjson
+
+CONFIG_DIR = Path(__file__).parent.parent / "config"
+
+
+@functools.lru_cache(maxsize=1)
+def load_providers_catalog() -> dict:
+    """Lädt providers_kiff.json (gecacht)"""
+    path = Path(os.getenv("KIFF_PROVIDERS_JSON", CONFIG_DIR / "providers_kiff.json"))
+    return orjson.loads(path.read_bytes())
+
+
+@functools.lru_cache(maxsize=1)
+def load_models_catalog() -> dict:
+    """Lädt models_kiff.json (gecacht)"""
+    path = Path(os.getenv("KIFF_MODELS_JSON", CONFIG_DIR / "models_kiff.json"))
+    return orjson.loads(path.read_bytes())
+
+
+def get_provider_models(provider_key: str) -> dict:
+    """
+    Gibt die Model-Definitionen eines Providers zurück
+
+    Args:
+        provider_key: Schlüssel in models_kiff.json["providers"] (z.B. "groq", "lokal")
+
+    Returns:
+        Dict model_id -> Model-Daten (leer wenn nicht vorhanden)
+    """
+    return load_models_catalog().get("providers", {}).get(provider_key, {}).get("models", {})
+
+
+def reload_catalogs() -> None:
+    """Verwirft die gecachten Kataloge (z.B. nach Änderung der JSON-Dateien)"""
+    load_providers_catalog.cache_clear()
+    load_models_catalog.cache_clear()
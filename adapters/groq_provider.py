@@ -6,9 +6,14 @@ Nutzt OpenAI-kompatible Chat Completions API von Groq
 """
 
 import os
-from typing import List, Optional
-import requests
+import re
+from typing import AsyncIterator, Dict, List, Optional
+import httpx
+import orjson
 
+from backend.adapters.catalog import get_provider_models
+from backend.adapters.http import get_http_client, post_with_retry
+from backend.adapters.rate_limiter import AsyncTokenBucket
 from backend.adapters.base_provider import (
     AbstractLLMProvider,
     ProviderConfig,
@@ -18,6 +23,9 @@ from backend.adapters.base_provider import (
     ProviderValidationResult
 )
 
+# Kosten-Format in models_kiff.json: "$0.20/$0.30 per 1k"
+_COST_PATTERN = re.compile(r"\$([\d.]+)/\$([\d.]+)")
+
 
 class GroqProvider(AbstractLLMProvider):
     """
@@ -25,12 +33,15 @@ class GroqProvider(AbstractLLMProvider):
     Nutzt Groq LPU™ Inference Engine mit OpenAI-kompatiblem API
     """
     
-    def __init__(self, config: ProviderConfig, models_config: dict):
+    def __init__(self, config: ProviderConfig):
         super().__init__(config)
         self.base_url = config.base_url
-        self.models_config = models_config.get("groq", {}).get("models", {})
+        self.models_config = get_provider_models("groq")
         self.api_key = self._get_api_key(config.api_key_env)
+        self._headers = self._build_headers(self.api_key) if self.api_key else None
         self.timeout = 30  # Groq ist schnell, 30s reicht
+        # Groq limitiert pro Modell -> ein Token Bucket pro Modell
+        self._buckets: Dict[str, AsyncTokenBucket] = {}
         
     def _get_api_key(self, env_var: Optional[str]) -> Optional[str]:
         """Get API key from environment"""
@@ -38,6 +49,61 @@ class GroqProvider(AbstractLLMProvider):
             return os.getenv(env_var)
         return None
     
+    @staticmethod
+    def _build_headers(api_key: str) -> Dict[str, str]:
+        """Request headers for a given API key"""
+        return {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled HTTP client (16 connections, re-created after shutdown)"""
+        return get_http_client("groq", max_connections=16)
+    
+    def _bucket_for(self, model: str) -> AsyncTokenBucket:
+        """Get or create the rate limit bucket for a model (limits from config.rate_limits)"""
+        bucket = self._buckets.get(model)
+        if bucket is None:
+            limits = self.config.rate_limits
+            bucket = AsyncTokenBucket(
+                rpm=limits.get("requests_per_minute"),
+                tpm=limits.get("tokens_per_minute"),
+            )
+            self._buckets[model] = bucket
+        return bucket
+    
+    @staticmethod
+    def _estimate_tokens(messages: List[ChatMessage], max_tokens: Optional[int]) -> int:
+        """Rough token estimate (~4 chars per token) plus reserved completion tokens"""
+        prompt_chars = sum(len(m.content) for m in messages)
+        return prompt_chars // 4 + (max_tokens or 0)
+    
+    @staticmethod
+    def _build_payload(
+        messages: List[ChatMessage],
+        model: str,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        stream: bool,
+        **kwargs
+    ) -> dict:
+        """Build OpenAI-compatible chat completion payload"""
+        payload = {
+            "model": model,
+            "messages": messages,
+            "stream": stream,
+        }
+        
+        if temperature is not None:
+            payload["temperature"] = temperature
+        if max_tokens is not None:
+            payload["max_tokens"] = max_tokens
+        if kwargs.get("top_p"):
+            payload["top_p"] = kwargs["top_p"]
+        return payload
+    
     async def chat(
         self,
         messages: List[ChatMessage],
@@ -51,37 +117,33 @@ class GroqProvider(AbstractLLMProvider):
         if not self.api_key:
             raise RuntimeError("Groq API-Key fehlt. Bitte GROQ_API_KEY setzen.")
         
-        # Convert ChatMessage objects to dict
-        messages_dict = [{"role": msg.role, "content": msg.content} for msg in messages]
+        payload = self._build_payload(messages, model, temperature, max_tokens, stream=False, **kwargs)
         
-        # Build payload (OpenAI-compatible)
-        payload = {
-            "model": model,
-            "messages": messages_dict,
-            "stream": False,
-        }
-        
-        if temperature is not None:
-            payload["temperature"] = temperature
-        if max_tokens is not None:
-            payload["max_tokens"] = max_tokens
-        if kwargs.get("top_p"):
-            payload["top_p"] = kwargs["top_p"]
+        # Deterministische Anfragen aus dem Response-Cache bedienen
+        if temperature == 0:
+            return await self._cached_response(payload, lambda: self._send_chat(payload))
+        return await self._send_chat(payload)
+    
+    async def _send_chat(self, payload: dict) -> ChatResponse:
+        """POST a prepared payload to /chat/completions"""
+        model = payload["model"]
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        # Proaktiv drosseln statt 429-Roundtrips zu riskieren
+        bucket = self._bucket_for(model)
+        reserved_tokens = await bucket.acquire(
+            self._estimate_tokens(payload["messages"], payload.get("max_tokens"))
+        )
         
         try:
-            response = requests.post(
+            response = await post_with_retry(
+                self.client,
                 f"{self.base_url}/chat/completions",
-                json=payload,
-                headers=headers,
+                content=orjson.dumps(payload),
+                headers=self._headers,
                 timeout=self.timeout
             )
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             
             # Extract rate limit headers
             rate_limit_info = {}
@@ -102,6 +164,7 @@ class GroqProvider(AbstractLLMProvider):
             # Extract usage
             usage = result.get("usage", {})
             total_tokens = usage.get("total_tokens", 0)
+            bucket.reconcile(reserved_tokens, total_tokens)
             
             # Calculate cost (simplified - aus models config holen)
             model_info = self.get_model_info(model)
@@ -123,7 +186,7 @@ class GroqProvider(AbstractLLMProvider):
                 }
             )
             
-        except requests.exceptions.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             # Handle rate limits and auth errors
             if e.response.status_code == 429:
                 raise RuntimeError("Groq Rate Limit erreicht. Bitte später erneut versuchen.")
@@ -131,47 +194,102 @@ class GroqProvider(AbstractLLMProvider):
                 raise RuntimeError("Groq API-Key ungültig. Bitte überprüfen.")
             else:
                 raise RuntimeError(f"Groq API Error: {e}")
-        except requests.exceptions.RequestException as e:
+        except httpx.RequestError as e:
+            raise RuntimeError(f"Groq request failed: {e}")
+        except (ValueError, IndexError, AttributeError) as e:
+            # Ungültiges JSON oder unerwartete Antwortstruktur
+            raise RuntimeError(f"Groq returned an invalid response: {e}")
+    
+    async def chat_stream(
+        self,
+        messages: List[ChatMessage],
+        model: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream chat completion from Groq (SSE "data:" frames)"""
+        
+        if not self.api_key:
+            raise RuntimeError("Groq API-Key fehlt. Bitte GROQ_API_KEY setzen.")
+        
+        payload = self._build_payload(messages, model, temperature, max_tokens, stream=True, **kwargs)
+        
+        bucket = self._bucket_for(model)
+        reserved_tokens = await bucket.acquire(self._estimate_tokens(messages, max_tokens))
+        
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                content=orjson.dumps(payload),
+                headers=self._headers,
+                timeout=self.timeout
+            ) as response:
+                if response.status_code == 429:
+                    raise RuntimeError("Groq Rate Limit erreicht. Bitte später erneut versuchen.")
+                elif response.status_code == 401:
+                    raise RuntimeError("Groq API-Key ungültig. Bitte überprüfen.")
+                response.raise_for_status()
+                
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    
+                    chunk = orjson.loads(data)
+                    # Groq hängt die Usage an den letzten Chunk (x_groq.usage)
+                    usage = chunk.get("x_groq", {}).get("usage")
+                    if usage:
+                        bucket.reconcile(reserved_tokens, usage.get("total_tokens", 0))
+                    
+                    choices = chunk.get("choices") or [{}]
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+                        
+        except httpx.HTTPStatusError as e:
+            raise RuntimeError(f"Groq API Error: {e}")
+        except httpx.RequestError as e:
             raise RuntimeError(f"Groq request failed: {e}")
-        except Exception as e:
-            raise RuntimeError(f"Unexpected error: {e}")
     
     def _calculate_cost(self, usage: dict, model_info: Optional[ModelInfo]) -> dict:
         """
-        Calculate cost based on token usage
+        Calculate cost based on token usage (prices pre-parsed in get_models)
         
         Note: Viele Groq-Modelle sind aktuell kostenlos im Free Tier
         """
-        if not model_info or not model_info.metadata:
+        if not model_info or model_info.is_free:
             return {"total_cost": 0.0, "note": "Kostenlos im Free Tier"}
         
-        # Parse cost from metadata (format: "$0.20/$0.30 per 1k")
-        cost_str = model_info.metadata.get("cost", "$0.00/$0.00")
-        if "kostenlos" in cost_str.lower() or "free" in cost_str.lower():
-            return {"total_cost": 0.0, "note": "Kostenlos im Free Tier"}
+        input_cost = usage.get("prompt_tokens", 0) / 1000 * model_info.input_cost_per_1k
+        output_cost = usage.get("completion_tokens", 0) / 1000 * model_info.output_cost_per_1k
         
-        # Extract input/output costs
-        try:
-            parts = cost_str.split("/")
-            input_cost_per_1k = float(parts[0].replace("$", "").strip())
-            output_cost_per_1k = float(parts[1].split(" ")[0].replace("$", "").strip())
-            
-            prompt_tokens = usage.get("prompt_tokens", 0)
-            completion_tokens = usage.get("completion_tokens", 0)
-            
-            input_cost = (prompt_tokens / 1000) * input_cost_per_1k
-            output_cost = (completion_tokens / 1000) * output_cost_per_1k
-            total_cost = input_cost + output_cost
-            
-            return {
-                "total_cost": round(total_cost, 6),
-                "input_cost": round(input_cost, 6),
-                "output_cost": round(output_cost, 6),
-                "input_cost_per_1k": input_cost_per_1k,
-                "output_cost_per_1k": output_cost_per_1k
-            }
-        except:
-            return {"total_cost": 0.0, "note": "Kostenberechnung fehlgeschlagen"}
+        return {
+            "total_cost": round(input_cost + output_cost, 6),
+            "input_cost": round(input_cost, 6),
+            "output_cost": round(output_cost, 6),
+            "input_cost_per_1k": model_info.input_cost_per_1k,
+            "output_cost_per_1k": model_info.output_cost_per_1k
+        }
+    
+    @staticmethod
+    def _parse_cost(metadata: dict) -> dict:
+        """Parse metadata["cost"] once into numeric ModelInfo fields"""
+        cost_str = metadata.get("cost", "")
+        lowered = cost_str.lower()
+        if not cost_str or "kostenlos" in lowered or "free" in lowered:
+            return {"is_free": True}
+        
+        match = _COST_PATTERN.search(cost_str)
+        if not match:
+            return {}
+        return {
+            "input_cost_per_1k": float(match.group(1)),
+            "output_cost_per_1k": float(match.group(2)),
+        }
     
     async def validate(self, api_key: Optional[str] = None) -> ProviderValidationResult:
         """Validate Groq API access"""
@@ -185,30 +303,17 @@ class GroqProvider(AbstractLLMProvider):
                 message="Kein API-Key vorhanden. Bitte GROQ_API_KEY setzen oder Key eingeben."
             )
         
-        # Test with simple request
-        headers = {
-            "Authorization": f"Bearer {test_key}",
-            "Content-Type": "application/json"
-        }
-        
-        # Use minimal payload to test auth
-        payload = {
-            "model": "llama-3.1-8b-instant",  # Fast model for validation
-            "messages": [{"role": "user", "content": "test"}],
-            "max_tokens": 5
-        }
+        # GET /models prüft den Key ohne Tokens oder Rate-Limit-Budget zu verbrauchen
+        headers = self._headers if test_key == self.api_key else self._build_headers(test_key)
         
         try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                json=payload,
+            response = await self.client.get(
+                f"{self.base_url}/models",
                 headers=headers,
-                timeout=10
+                timeout=5
             )
             
-            print(f"🔍 Groq Validation Request:")
-            print(f"   Model: {payload['model']}")
-            print(f"   Status: {response.status_code}")
+            print(f"🔍 Groq Validation Request: GET /models -> {response.status_code}")
             
             if response.status_code == 200:
                 return ProviderValidationResult(
@@ -245,9 +350,13 @@ class GroqProvider(AbstractLLMProvider):
             )
     
     def get_models(self) -> List[ModelInfo]:
-        """Get available Groq models from config"""
+        """Get available Groq models from config (built once, then cached)"""
+        if self._models_cache is not None:
+            return self._models_cache
+        
         models = []
         for model_id, model_data in self.models_config.items():
+            metadata = model_data.get("metadata", {})
             models.append(ModelInfo(
                 model_id=model_id,
                 display_name=model_data.get("display_name", model_id),
@@ -256,14 +365,23 @@ class GroqProvider(AbstractLLMProvider):
                 context_size=model_data.get("context_size", 8192),
                 is_default=model_data.get("is_default", False),
                 capabilities=model_data.get("capabilities", []),
-                metadata=model_data.get("metadata", {})
+                metadata=metadata,
+                **self._parse_cost(metadata)
             ))
+        self._models_cache = models
         return models
     
-    async def is_healthy(self) -> bool:
-        """Check if Groq API is reachable"""
+    async def _check_health(self) -> bool:
+        """Check if Groq API is reachable (GET /models, no completion budget used)"""
         if not self.api_key:
             return False
         
-        result = await self.validate()
-        return result.valid
+        try:
+            response = await self.client.get(
+                f"{self.base_url}/models",
+                headers=self._headers,
+                timeout=5
+            )
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
@@ -0,0 +1,101 @@
+"""
+http.py
+
+Gemeinsamer HTTP-Client-Pool für alle Provider
+- Ein httpx.AsyncClient pro Pool (Keep-Alive, TCP/TLS-Wiederverwendung)
+- Pool-Größe pro Provider konfigurierbar (z.B. Groq=16, Ollama=4)
+- Wird beim Shutdown der API über close_http_clients() geschlossen
+- post_with_retry(): begrenzte Wiederholung bei transienten Fehlern (decorrelated jitter)
+"""
+
+import asyncio
+import random
+from typing import Dict
+
+import httpx
+
+DEFAULT_POOL_SIZE = 32
+# Lokales Ollama: wenige Verbindungen reichen, geteilt von OllamaProvider, LLMClient und Health-Checks
+OLLAMA_POOL_SIZE = 4
+KEEPALIVE_EXPIRY = 60.0  # Sekunden
+
+# Transiente Fehler, die eine Wiederholung rechtfertigen (4xx inkl. 429 nie)
+RETRY_STATUS_CODES = {502, 503, 504}
+RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ReadTimeout)
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(pool: str = "default", max_connections: int = DEFAULT_POOL_SIZE) -> httpx.AsyncClient:
+    """
+    Gibt den gemeinsamen AsyncClient für einen Pool zurück (lazy erstellt)
+
+    Args:
+        pool: Pool-Name, üblicherweise der Provider-Typ ("groq", "ollama")
+        max_connections: Maximale gleichzeitige Verbindungen im Pool
+
+    Returns:
+        httpx.AsyncClient mit Keep-Alive Connection-Pool
+    """
+    client = _clients.get(pool)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            )
+        )
+        _clients[pool] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Schließt alle Pools und gibt die Sockets frei"""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+async def post_with_retry(
+    client: httpx.AsyncClient,
+    url: str,
+    max_attempts: int = 3,
+    base_delay: float = 0.25,
+    max_delay: float = 4.0,
+    **kwargs
+) -> httpx.Response:
+    """
+    POST mit begrenzter Wiederholung bei 502/503/504 und Verbindungsfehlern
+
+    Wartezeit zwischen Versuchen: decorrelated jitter,
+    random.uniform(base_delay, min(max_delay, vorherige * 3)).
+
+    Args:
+        client: AsyncClient aus get_http_client()
+        url: Ziel-URL
+        max_attempts: Maximale Anzahl Versuche (inkl. erstem)
+        base_delay: Minimale Wartezeit in Sekunden
+        max_delay: Obergrenze der Wartezeit in Sekunden
+        **kwargs: Weitere Argumente für client.post()
+
+    Returns:
+        Letzte Response (auch bei weiterhin transientem Status)
+
+    Raises:
+        httpx.ConnectError / httpx.ReadTimeout: Wenn auch der letzte Versuch scheitert
+    """
+    delay = base_delay
+    for attempt in range(1, max_attempts + 1):
+        try:
+            response = await client.post(url, **kwargs)
+        except RETRY_EXCEPTIONS:
+            if attempt == max_attempts:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or attempt == max_attempts:
+                return response
+
+        delay = random.uniform(base_delay, min(max_delay, delay * 3))
+        await asyncio.sleep(delay)
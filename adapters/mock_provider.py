@@ -5,8 +5,8 @@ Mock Provider für Tests
 Simuliert LLM-Antworten ohne echte API-Calls
 """
 
+import asyncio
 from typing import List, Optional
-import time
 
 from backend.adapters.base_provider import (
     AbstractLLMProvider,
@@ -24,8 +24,14 @@ class MockProvider(AbstractLLMProvider):
     Gibt vordefinierte Antworten zurück ohne echte API-Calls
     """
     
-    def __init__(self, config: ProviderConfig, mock_responses: Optional[dict] = None):
+    def __init__(
+        self,
+        config: ProviderConfig,
+        mock_responses: Optional[dict] = None,
+        simulated_latency: float = 0.0
+    ):
         super().__init__(config)
+        self.simulated_latency = simulated_latency  # Sekunden, 0 = sofort
         self.mock_responses = mock_responses or {
             "default": "Dies ist eine Mock-Antwort vom Test-Provider."
         }
@@ -51,8 +57,9 @@ class MockProvider(AbstractLLMProvider):
             "kwargs": kwargs
         }
         
-        # Simulate some processing time
-        time.sleep(0.1)
+        # Simulate some processing time (non-blocking, mocks overlap like real calls)
+        if self.simulated_latency:
+            await asyncio.sleep(self.simulated_latency)
         
         # Get mock response
         user_message = messages[-1].content if messages else ""
@@ -102,7 +109,7 @@ class MockProvider(AbstractLLMProvider):
             )
         ]
     
-    async def is_healthy(self) -> bool:
+    async def _check_health(self) -> bool:
         """Always healthy"""
         return True
     
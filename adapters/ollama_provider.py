@@ -5,11 +5,15 @@ Ollama Provider Implementation
 Wrapper für bestehende LLMClient-Logik als AbstractLLMProvider
 """
 
+import functools
 import os
-import json
-from typing import List, Optional
-import requests
+import re
+from typing import AsyncIterator, List, Optional
+import httpx
+import orjson
 
+from backend.adapters.catalog import get_provider_models
+from backend.adapters.http import OLLAMA_POOL_SIZE, get_http_client, post_with_retry
 from backend.adapters.base_provider import (
     AbstractLLMProvider,
     ProviderConfig,
@@ -19,6 +23,22 @@ from backend.adapters.base_provider import (
     ProviderValidationResult
 )
 
+# Einmal beim Import gelesen (vorher lädt api/main.py die .env), siehe reload_env()
+_TIMEOUT = int(os.getenv("LLM_CLIENT_TIMEOUT", "180"))
+_KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE", "5m")
+
+# ${VAR} oder ${VAR:default} – der Default darf selbst Doppelpunkte enthalten
+_ENV_TMPL = re.compile(r"\$\{(\w+)(?::([^}]*))?\}")
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_env_template(template: str) -> str:
+    """Ersetzt ${VAR:default} Platzhalter durch ENV-Werte (einmal pro Template)"""
+    return _ENV_TMPL.sub(
+        lambda m: os.getenv(m.group(1), m.group(2) or ""),
+        template
+    )
+
 
 class OllamaProvider(AbstractLLMProvider):
     """
@@ -26,34 +46,36 @@ class OllamaProvider(AbstractLLMProvider):
     Nutzt llama.cpp mit Ollama Server
     """
     
-    def __init__(self, config: ProviderConfig, models_config: dict):
+    def __init__(self, config: ProviderConfig):
         super().__init__(config)
-        self.base_url = self._resolve_base_url(config.base_url)
-        self.models_config = models_config.get("lokal", {}).get("models", {})
-        self.timeout = int(os.getenv("LLM_CLIENT_TIMEOUT", "180"))
-        self.keep_alive = os.getenv("LLM_KEEP_ALIVE", "5m")
+        self.base_url = _resolve_env_template(config.base_url)
+        self.models_config = get_provider_models("lokal")
+        self.timeout = _TIMEOUT
+        self.keep_alive = _KEEP_ALIVE
+    
+    @classmethod
+    def reload_env(cls) -> None:
+        """Re-read ENV settings (for tests); affects providers created afterwards"""
+        global _TIMEOUT, _KEEP_ALIVE
+        _TIMEOUT = int(os.getenv("LLM_CLIENT_TIMEOUT", "180"))
+        _KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE", "5m")
+        _resolve_env_template.cache_clear()
         
-    def _resolve_base_url(self, url_template: str) -> str:
-        """Resolve ENV variable in URL template"""
-        if "${" in url_template:
-            # Extract default: ${LLM_SERVER_URL:http://localhost:11434}
-            parts = url_template.split(":")
-            env_var = parts[0].replace("${", "").replace("}", "")
-            default = ":".join(parts[1:]).replace("}", "") if len(parts) > 1 else "http://localhost:11434"
-            return os.getenv(env_var, default)
-        return url_template
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled HTTP client (4 connections, re-created after shutdown)"""
+        return get_http_client("ollama", max_connections=OLLAMA_POOL_SIZE)
     
-    async def chat(
+    def _build_payload(
         self,
         messages: List[ChatMessage],
         model: str,
-        temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        stream: bool,
         **kwargs
-    ) -> ChatResponse:
-        """Send chat request to Ollama"""
-        
-        # Build options
+    ) -> dict:
+        """Build Ollama /api/chat payload"""
         options = {}
         if temperature is not None:
             options["temperature"] = temperature
@@ -64,25 +86,45 @@ class OllamaProvider(AbstractLLMProvider):
         if kwargs.get("top_k"):
             options["top_k"] = kwargs["top_k"]
         
-        # Convert ChatMessage objects to dict
-        messages_dict = [{"role": msg.role, "content": msg.content} for msg in messages]
-        
-        payload = {
+        return {
             "model": model,
-            "messages": messages_dict,
-            "stream": False,
+            "messages": messages,
+            "stream": stream,
             "keep_alive": kwargs.get("keep_alive", self.keep_alive),
-            "options": options if options else {}
+            "options": options
         }
+    
+    async def chat(
+        self,
+        messages: List[ChatMessage],
+        model: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> ChatResponse:
+        """Send chat request to Ollama"""
+        
+        payload = self._build_payload(messages, model, temperature, max_tokens, stream=False, **kwargs)
+        
+        # Deterministische Anfragen aus dem Response-Cache bedienen
+        if temperature == 0:
+            return await self._cached_response(payload, lambda: self._send_chat(payload))
+        return await self._send_chat(payload)
+    
+    async def _send_chat(self, payload: dict) -> ChatResponse:
+        """POST a prepared payload to /api/chat"""
+        model = payload["model"]
         
         try:
-            response = requests.post(
+            response = await post_with_retry(
+                self.client,
                 f"{self.base_url}/api/chat",
-                json=payload,
+                content=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"},
                 timeout=self.timeout
             )
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             
             message = result.get("message", {})
             content = message.get("content", "").strip()
@@ -103,17 +145,52 @@ class OllamaProvider(AbstractLLMProvider):
                 }
             )
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Ollama request failed: {e}")
+        except (ValueError, IndexError, AttributeError) as e:
+            # Ungültiges JSON oder unerwartete Antwortstruktur
+            raise RuntimeError(f"Ollama returned an invalid response: {e}")
+    
+    async def chat_stream(
+        self,
+        messages: List[ChatMessage],
+        model: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream chat response from Ollama (NDJSON, eine Zeile pro Chunk)"""
+        
+        payload = self._build_payload(messages, model, temperature, max_tokens, stream=True, **kwargs)
+        
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.base_url}/api/chat",
+                content=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"},
+                timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = orjson.loads(line)
+                    content = chunk.get("message", {}).get("content")
+                    if content:
+                        yield content
+                    if chunk.get("done"):
+                        break
+                        
+        except httpx.HTTPError as e:
             raise RuntimeError(f"Ollama request failed: {e}")
-        except Exception as e:
-            raise RuntimeError(f"Unexpected error: {e}")
     
     async def validate(self, api_key: Optional[str] = None) -> ProviderValidationResult:
         """Validate Ollama server is reachable"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = await self.client.get(f"{self.base_url}/api/tags", timeout=5)
             if response.status_code == 200:
-                tags = response.json().get("models", [])
+                tags = orjson.loads(response.content).get("models", [])
                 return ProviderValidationResult(
                     valid=True,
                     message="Ollama server erreichbar",
@@ -131,7 +208,10 @@ class OllamaProvider(AbstractLLMProvider):
             )
     
     def get_models(self) -> List[ModelInfo]:
-        """Get available local models from config"""
+        """Get available local models from config (built once, then cached)"""
+        if self._models_cache is not None:
+            return self._models_cache
+        
         models = []
         for model_id, model_data in self.models_config.items():
             models.append(ModelInfo(
@@ -144,12 +224,13 @@ class OllamaProvider(AbstractLLMProvider):
                 capabilities=model_data.get("capabilities", []),
                 metadata=model_data.get("metadata", {})
             ))
+        self._models_cache = models
         return models
     
-    async def is_healthy(self) -> bool:
+    async def _check_health(self) -> bool:
         """Check if Ollama is healthy"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
+            response = await self.client.get(f"{self.base_url}/api/tags", timeout=2)
             return response.status_code == 200
-        except:
+        except httpx.HTTPError:
             return False
@@ -0,0 +1,93 @@
+"""
+rate_limiter.py
+
+Client-seitiger Token-Bucket Rate Limiter für Provider-Aufrufe
+- Drosselt Requests pro Minute (RPM) und Tokens pro Minute (TPM) proaktiv
+- Wartende Coroutinen schlafen lokal statt HTTP 429 vom Provider zu kassieren
+- Token-Schätzung kann nach der Antwort mit der echten Usage abgeglichen werden
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class AsyncTokenBucket:
+    """
+    Token Bucket mit getrennten Budgets für Requests und Tokens
+
+    Beide Budgets füllen sich kontinuierlich (monotonic clock) bis zur
+    Kapazität von einer Minute auf. Ein Limit von None bedeutet unbegrenzt.
+    """
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        """
+        Args:
+            rpm: Erlaubte Requests pro Minute (None = unbegrenzt)
+            tpm: Erlaubte Tokens pro Minute (None = unbegrenzt)
+        """
+        self.rpm = rpm or None
+        self.tpm = tpm or None
+        self._requests = float(self.rpm or 0)
+        self._tokens = float(self.tpm or 0)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Füllt beide Budgets entsprechend der vergangenen Zeit auf"""
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(float(self.rpm), self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(float(self.tpm), self._tokens + elapsed * self.tpm / 60)
+
+    def _wait_time(self, tokens: int) -> float:
+        """Sekunden bis genug Budget für einen Request mit `tokens` vorhanden ist"""
+        wait = 0.0
+        if self.rpm and self._requests < 1:
+            wait = (1 - self._requests) * 60 / self.rpm
+        if self.tpm and self._tokens < tokens:
+            wait = max(wait, (tokens - self._tokens) * 60 / self.tpm)
+        return wait
+
+    async def acquire(self, tokens: int = 0) -> int:
+        """
+        Wartet bis ein Request mit geschätzt `tokens` Tokens erlaubt ist
+
+        Args:
+            tokens: Geschätzter Token-Verbrauch (Prompt + max. Completion)
+
+        Returns:
+            Tatsächlich reservierte Tokens (für reconcile())
+        """
+        if self.tpm:
+            # Anfragen größer als das Minutenbudget würden sonst nie durchgelassen
+            tokens = min(tokens, self.tpm)
+
+        async with self._lock:
+            self._refill()
+            wait = self._wait_time(tokens)
+            while wait > 0:
+                await asyncio.sleep(wait)
+                self._refill()
+                wait = self._wait_time(tokens)
+
+            if self.rpm:
+                self._requests -= 1
+            if self.tpm:
+                self._tokens -= tokens
+
+        return tokens
+
+    def reconcile(self, estimated: int, actual: int) -> None:
+        """
+        Gleicht die Schätzung mit dem tatsächlichen Verbrauch ab
+
+        Args:
+            estimated: Bei acquire() reservierte Tokens
+            actual: Laut Provider-Antwort verbrauchte Tokens
+        """
+        if self.tpm:
+            self._tokens = min(float(self.tpm), self._tokens + estimated - actual)
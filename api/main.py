@@ -5,11 +5,13 @@ FastAPI Application for KIFF LangChain Agent
 Provides REST API with OpenAPI/Swagger documentation
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
-import sys
+import asyncio
+import importlib
+import logging
 import subprocess
 import platform
 from pathlib import Path
@@ -21,84 +23,137 @@ if env_path.exists():
     load_dotenv(env_path)
     print(f"✅ Loaded environment variables from {env_path}")
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from backend.api.responses import ORJSONResponse
+import orjson
 
-from backend.api.v1 import chat, config, health, documents, server, mcp
-from backend.core.server_manager import ServerManager
-from backend.core.model_registry import ModelRegistry
-from backend.core.llm_client import LLMClient
-from backend.core.profile_agent import ProfileAgent
+logger = logging.getLogger(__name__)
+
+# Fester Teil der 500-Antwort, einmal beim Import serialisiert (ohne schließende Klammer)
+_INTERNAL_ERROR_PREFIX = orjson.dumps({
+    "code": "INTERNAL_ERROR",
+    "message": "An unexpected error occurred",
+})[:-1]
+
+# Router-Tabelle: (Modul, Prefix, Tag) – Module werden erst in _register_routers importiert
+ROUTERS = [
+    ("backend.api.v1.health", "/api/v1", "Health"),
+    ("backend.api.v1.server", "/api/v1/server", "Server Management"),
+    ("backend.api.v1.config", "/api/v1", "Configuration"),
+    ("backend.api.v1.chat", "/api/v1", "Chat"),
+    ("backend.api.v1.documents", "/api/v1", "Documents"),
+    ("backend.api.v1.mcp", "/api/v1/mcp", "MCP"),
+]
 
 # Global instances
 _server_manager = None
 _model_registry = None
 _llm_client = None
 _profile_agent = None
+_ollama_proc = None  # von uns gestarteter "ollama serve"-Prozess
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Lifecycle management for FastAPI app"""
-    global _server_manager, _model_registry, _llm_client, _profile_agent
+async def _ensure_ollama(llm_client, max_wait: float = 5.0):
+    """
+    Prüft ob Ollama läuft, startet es sonst und wartet mit exponentiellem Backoff
     
-    # Startup
-    print("🚀 Starting KIFF API Server...")
+    Setzt health.ollama_ready, sobald Ollama erreichbar ist.
+    """
+    import backend.api.v1.health as health_module
     
-    # Auto-start Ollama if not running
     try:
         print("🔍 Checking Ollama status...")
-        _llm_client = LLMClient()
-        if not _llm_client.is_healthy():
-            print("⚙️ Ollama not running, attempting to start...")
-            if platform.system() == "Windows":
-                # Windows: Start Ollama app in background
-                subprocess.Popen(["ollama", "serve"], 
-                               creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0,
-                               stdout=subprocess.DEVNULL,
-                               stderr=subprocess.DEVNULL)
-            else:
-                # Linux/Mac: Start Ollama service
-                subprocess.Popen(["ollama", "serve"],
-                               stdout=subprocess.DEVNULL,
-                               stderr=subprocess.DEVNULL)
-            
-            # Wait a moment for Ollama to start
-            import time
-            for i in range(10):
-                time.sleep(1)
-                if _llm_client.is_healthy():
-                    print("✅ Ollama started successfully")
-                    break
-            else:
-                print("⚠️ Ollama did not start within timeout, continuing anyway...")
-        else:
+        if await llm_client.is_healthy():
             print("✅ Ollama is already running")
+            health_module.ollama_ready = True
+            return
+        
+        print("⚙️ Ollama not running, attempting to start...")
+        global _ollama_proc
+        # Windows: ohne Konsolenfenster starten
+        creationflags = subprocess.CREATE_NO_WINDOW if platform.system() == "Windows" else 0
+        _ollama_proc = await asyncio.create_subprocess_exec(
+            "ollama", "serve",
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+            creationflags=creationflags,
+        )
+        
+        # Backoff 0.1s, 0.2s, 0.4s, ... (max. 1s pro Schritt, insgesamt max_wait)
+        delay, waited = 0.1, 0.0
+        while waited < max_wait:
+            await asyncio.sleep(delay)
+            waited += delay
+            if await llm_client.is_healthy():
+                print("✅ Ollama started successfully")
+                health_module.ollama_ready = True
+                return
+            delay = min(delay * 2, 1.0)
+        print("⚠️ Ollama did not start within timeout, continuing anyway...")
     except Exception as e:
         print(f"⚠️ Could not auto-start Ollama: {e}")
         print("   Please start Ollama manually: 'ollama serve'")
+
+
+async def _stop_ollama(timeout: float = 5.0):
+    """Beendet den von _ensure_ollama gestarteten Ollama-Prozess (falls vorhanden)"""
+    global _ollama_proc
+    proc, _ollama_proc = _ollama_proc, None
+    if proc is None or proc.returncode is not None:
+        return
+    print("🛑 Stopping Ollama...")
+    try:
+        proc.terminate()
+        try:
+            await asyncio.wait_for(proc.wait(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+    except ProcessLookupError:
+        pass
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Lifecycle management for FastAPI app"""
+    global _server_manager, _model_registry, _llm_client, _profile_agent
+    
+    # Startup
+    print("🚀 Starting KIFF API Server...")
+    history_flusher = None
+    
+    # Core-Komponenten erst beim Start laden, nicht beim Import von main
+    from backend.core.llm_client import LLMClient
+    from backend.core.json_cache import load_json
+    from backend.core.provider_manager import get_provider_manager
+    
+    # Ollama-Check/Autostart läuft im Hintergrund, die API ist sofort erreichbar
+    _llm_client = LLMClient()
+    ollama_task = asyncio.create_task(_ensure_ollama(_llm_client))
     
     # Initialize components
     try:
-        _model_registry = ModelRegistry()
-        if not _llm_client:
-            _llm_client = LLMClient()
-        _profile_agent = ProfileAgent(_llm_client)
-        _server_manager = ServerManager()
-        
-        # Inject instances into modules
-        import backend.api.v1.server as server_module
         import backend.api.v1.chat as chat_module
         import backend.api.v1.config as config_module
+        import backend.api.v1.documents as documents_module
         import backend.api.v1.health as health_module
         
-        server_module.server_manager = _server_manager
-        chat_module.profile_agent = _profile_agent
-        config_module.model_registry = _model_registry
-        config_module.profile_agent = _profile_agent
-        config_module.server_manager = _server_manager
-        health_module.server_manager = _server_manager
-        health_module.llm_client = _llm_client
+        # Singletons der Router vorwärmen, damit schon der erste Request fertige Instanzen trifft
+        get_provider_manager()
+        _model_registry = config_module.get_model_registry()
+        _server_manager = health_module.get_server_manager()
+        _profile_agent = await chat_module.get_agent()
+        for config_file in (config_module.PROFILES_CONFIG_FILE, config_module.SERVERS_CONFIG_FILE):
+            if config_file.exists():
+                load_json(config_file)
+        documents_module._get_doc_index()
+        
+        # Fehlende Profile im Chat-Verlauf einmalig beim Start ergänzen
+        await chat_module.migrate_chat_history_profiles(chat_module.read_persisted_profile())
+        app.state.history_migrated = True
+        
+        # Angehängte Chat-Nachrichten gebündelt auf die Platte schreiben
+        history_flusher = asyncio.create_task(chat_module.chat_history_store.run_flusher())
         
         print("✅ All components initialized successfully")
     except Exception as e:
@@ -108,8 +163,19 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("🛑 Shutting down KIFF API Server...")
+    ollama_task.cancel()
+    if history_flusher:
+        history_flusher.cancel()
+    # Ausstehende Chat-Nachrichten nicht verlieren
+    import backend.api.v1.chat as chat_module
+    await chat_module.chat_history_store.flush()
     if _server_manager:
         _server_manager.stop_all_servers()
+    await _stop_ollama()
+    
+    # Release pooled provider connections
+    from backend.adapters.http import close_http_clients
+    await close_http_clients()
 
 
 # Initialize FastAPI app
@@ -121,25 +187,33 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/api/v1/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Große JSON-Antworten (/history, /chat/sessions) komprimieren, kleine unverändert lassen
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 # CORS configuration
+# Explizite Listen statt "*"; als zuletzt hinzugefügte Middleware ist CORS die
+# äußerste Schicht, Preflights (OPTIONS) erreichen das Routing gar nicht erst.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "http://localhost:3000"],  # Vue dev server
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
+    allow_headers=["content-type", "authorization"],
+    expose_headers=[],
 )
 
 
-# Include routers
-app.include_router(health.router, prefix="/api/v1", tags=["Health"])
-app.include_router(server.router, prefix="/api/v1/server", tags=["Server Management"])
-app.include_router(config.router, prefix="/api/v1", tags=["Configuration"])
-app.include_router(chat.router, prefix="/api/v1", tags=["Chat"])
-app.include_router(documents.router, prefix="/api/v1", tags=["Documents"])
-app.include_router(mcp.router, prefix="/api/v1/mcp", tags=["MCP"])
+def _register_routers(app: FastAPI) -> None:
+    """Importiert die Router-Module aus ROUTERS und bindet sie ein"""
+    for module_name, prefix, tag in ROUTERS:
+        module = importlib.import_module(module_name)
+        app.include_router(module.router, prefix=prefix, tags=[tag])
+
+
+_register_routers(app)
 
 
 @app.get("/")
@@ -156,22 +230,31 @@ async def root():
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
-    return JSONResponse(
+    logger.exception("Unhandled error on %s %s", request.method, request.url.path, exc_info=exc)
+    return Response(
+        content=_INTERNAL_ERROR_PREFIX + b',"details":' + orjson.dumps(str(exc)) + b"}",
         status_code=500,
-        content={
-            "code": "INTERNAL_ERROR",
-            "message": "An unexpected error occurred",
-            "details": str(exc),
-        },
+        media_type="application/json",
     )
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
+    
+    # DEBUG=1: Auto-Reload (ein Worker); sonst Produktions-Defaults
+    reload = os.getenv("DEBUG") == "1"
+    limit_concurrency = os.getenv("LIMIT_CONCURRENCY")
     uvicorn.run(
-        "main:app",
+        "backend.api.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=reload,
+        # uvloop gibt es nicht unter Windows
+        loop="asyncio" if platform.system() == "Windows" else "uvloop",
+        http="httptools",
+        # Provider-/Profil-Auswahl liegt im Prozess-Speicher -> Default ein Worker
+        workers=None if reload else int(os.getenv("WEB_CONCURRENCY", "1")),
+        limit_concurrency=int(limit_concurrency) if limit_concurrency else None,
         log_level="info"
     )
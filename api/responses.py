@@ -0,0 +1,19 @@
+"""
+responses.py
+
+Response-Klassen für die API
+- JSON-Encoding über orjson statt stdlib json (deutlich schneller)
+- Eigene Klasse, da fastapi.responses.ORJSONResponse in neueren FastAPI-Versionen deprecated ist
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse mit orjson-Serialisierung (App-weiter Default)"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -4,115 +4,119 @@ chat.py
 Chat and conversation endpoints
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import List
-import sys
-import json
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import os
+import threading
 import uuid
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+import orjson
 
 from backend.api.v1.models import (
-    ChatRequest, ChatResponse, ChatSession, ChatSessionList, ChatMessage
+    ChatRequest, ChatResponse, ChatSessionList
 )
-from backend.core.llm_client import LLMClient
+from backend.api.responses import ORJSONResponse
+from backend.core.chat_history import ChatHistoryStore
+from backend.core.persisted_selection import PersistedSelection
 from backend.core.profile_agent import ProfileAgent
 
 router = APIRouter()
 
 # Global instances
-_llm_client = None
 _agent = None
+_agent_lock = threading.Lock()
 
 # Use absolute paths rooted at the backend directory
 BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
-CHAT_HISTORY_FILE = BACKEND_DIR / "documents" / "chat_history.json"
+CHAT_HISTORY_FILE = BACKEND_DIR / "documents" / "chat_history.jsonl"
+LEGACY_CHAT_HISTORY_FILE = BACKEND_DIR / "documents" / "chat_history.json"
 CURRENT_PROFILE_FILE = BACKEND_DIR / "documents" / "current_profile.json"
+CURRENT_MODEL_FILE = BACKEND_DIR / "documents" / "current_model.json"
 
+# Aktive Verlaufsdatei begrenzen, ältere Nachrichten werden archiviert
+MAX_ACTIVE_HISTORY = int(os.getenv("CHAT_HISTORY_MAX_ACTIVE", "1000"))
 
-def get_llm_client():
-    """Get or create LLM client instance"""
-    global _llm_client
-    if _llm_client is None:
-        _llm_client = LLMClient()
-    return _llm_client
+chat_history_store = ChatHistoryStore(
+    CHAT_HISTORY_FILE,
+    legacy_path=LEGACY_CHAT_HISTORY_FILE,
+    max_active=MAX_ACTIVE_HISTORY or None,
+)
+
+# Persistierte Auswahl; Datei wird nur bei Änderung (mtime/size) neu geparst
+current_profile_store = PersistedSelection(CURRENT_PROFILE_FILE, "profile", default="general_chat")
+current_model_store = PersistedSelection(CURRENT_MODEL_FILE, "model")
+
+# (Profil, Provider) -> Modell für /profile/current; Profile werden nur beim Start geladen,
+# ein Profil- oder Providerwechsel ergibt einfach einen neuen Schlüssel
+_profile_model_cache: Dict[Tuple[str, str], str] = {}
 
+# Serialisierte /chat/sessions-Antwort, gültig solange chat_history_store.version gleich bleibt
+_sessions_cache: Optional[Tuple[int, bytes]] = None
 
-def migrate_chat_history_profiles(active_profile: str):
+
+async def migrate_chat_history_profiles(active_profile: str):
     """Annotate history messages with the active profile if missing and persist."""
+    def annotate(msg: dict) -> bool:
+        if isinstance(msg, dict) and not msg.get('profile'):
+            msg['profile'] = active_profile or 'general_chat'
+            return True
+        return False
+
     try:
-        if CHAT_HISTORY_FILE.exists():
-            data = []
-            with open(CHAT_HISTORY_FILE, 'r', encoding='utf-8') as f:
-                try:
-                    data = json.load(f)
-                except Exception:
-                    data = []
-
-            changed = False
-            for msg in data:
-                if isinstance(msg, dict):
-                    if 'profile' not in msg or not msg.get('profile'):
-                        msg['profile'] = active_profile or 'general_chat'
-                        changed = True
-            if changed:
-                save_chat_history(data)
+        await chat_history_store.update_where(annotate)
     except Exception as e:
         print(f"Warning: chat history migration failed: {e}")
 
 
 def read_persisted_profile() -> str:
-    """Read current profile from persisted file, fallback to 'general_chat'."""
-    try:
-        if CURRENT_PROFILE_FILE.exists():
-            data = json.loads(CURRENT_PROFILE_FILE.read_text(encoding="utf-8"))
-            p = data.get("profile")
-            if isinstance(p, str) and p:
-                return p
-    except Exception:
-        pass
-    return "general_chat"
+    """Current profile from persisted file, fallback to 'general_chat'."""
+    return current_profile_store.get()
+
+
+def read_persisted_model() -> Optional[str]:
+    """Current model from persisted file, None if not set."""
+    return current_model_store.get()
 
 
-def get_agent():
+async def get_agent():
     """Get or create agent instance"""
     global _agent
     if _agent is None:
-        from backend.core.provider_manager import get_provider_manager
-        provider_manager = get_provider_manager()
-        _agent = ProfileAgent(llm_client=None, provider_manager=provider_manager)
-        # Initialize from persisted profile if available
-        try:
-            if CURRENT_PROFILE_FILE.exists():
-                data = json.loads(CURRENT_PROFILE_FILE.read_text(encoding="utf-8"))
-                profile_name = data.get("profile")
-                if profile_name:
-                    _agent.set_profile(profile_name)
-        except Exception as e:
-            print(f"Warning: could not load current profile: {e}")
-        # Ensure history messages include a profile for UI rendering
-        try:
-            migrate_chat_history_profiles(_agent.get_current_profile())
-        except Exception as e:
-            print(f"Warning: could not migrate history profiles: {e}")
+        with _agent_lock:
+            if _agent is None:
+                from backend.core.provider_manager import get_provider_manager
+                provider_manager = get_provider_manager()
+                agent = ProfileAgent(llm_client=None, provider_manager=provider_manager)
+                # Initialize from persisted profile if available
+                try:
+                    agent.set_profile(read_persisted_profile())
+                except Exception as e:
+                    print(f"Warning: could not load current profile: {e}")
+                # Erst vollständig initialisiert veröffentlichen
+                _agent = agent
+        # History-Migration läuft einmalig im lifespan (api/main.py), nicht pro Request
     return _agent
 
 
 @router.post("/profile/{profile_name}")
 async def set_profile(profile_name: str):
     """Set active agent profile (used by frontend profile switch)"""
-    agent = get_agent()
+    agent = await get_agent()
+    previous_profile = read_persisted_profile()
     if agent.set_profile(profile_name):
+        if profile_name == previous_profile:
+            return {"message": f"Profile set to {profile_name}", "profile": profile_name}
         try:
-            CURRENT_PROFILE_FILE.parent.mkdir(parents=True, exist_ok=True)
-            CURRENT_PROFILE_FILE.write_text(json.dumps({"profile": profile_name}), encoding="utf-8")
+            current_profile_store.set(profile_name)
         except Exception as e:
             print(f"Warning: could not persist profile: {e}")
         # After changing profile, also migrate existing history entries lacking profile
         try:
-            migrate_chat_history_profiles(agent.get_current_profile())
+            await migrate_chat_history_profiles(agent.get_current_profile())
         except Exception as e:
             print(f"Warning: could not migrate history after profile set: {e}")
         return {"message": f"Profile set to {profile_name}", "profile": profile_name}
@@ -122,15 +126,15 @@ async def set_profile(profile_name: str):
 @router.post("/history/migrate_profile")
 async def migrate_history_profile():
     """Manually trigger migration to annotate messages with current profile."""
-    agent = get_agent()
-    migrate_chat_history_profiles(agent.get_current_profile())
+    agent = await get_agent()
+    await migrate_chat_history_profiles(agent.get_current_profile())
     return {"message": "History migration completed", "profile": agent.get_current_profile()}
 
 
 @router.get("/profile/current")
 async def get_current_profile():
     """Return current profile and model configured for that profile"""
-    agent = get_agent()
+    agent = await get_agent()
     current_prof = agent.get_current_profile()
     
     # Get current provider
@@ -138,13 +142,17 @@ async def get_current_profile():
     provider_manager = get_provider_manager()
     current_provider = provider_manager.get_current_provider_name()
     
-    # Get default model for current profile + provider
-    model_for_profile = agent.get_default_model_for_profile(current_prof, current_provider)
-    
-    if not model_for_profile:
-        # Fallback to first supported model
-        supported_models = agent.get_models_for_profile(current_prof, current_provider)
-        model_for_profile = supported_models[0] if supported_models else "unknown"
+    key = (current_prof, current_provider)
+    model_for_profile = _profile_model_cache.get(key)
+    if model_for_profile is None:
+        # Get default model for current profile + provider
+        model_for_profile = agent.get_default_model_for_profile(current_prof, current_provider)
+        
+        if not model_for_profile:
+            # Fallback to first supported model
+            supported_models = agent.get_models_for_profile(current_prof, current_provider)
+            model_for_profile = supported_models[0] if supported_models else "unknown"
+        _profile_model_cache[key] = model_for_profile
     
     return {
         "profile": current_prof,
@@ -153,25 +161,54 @@ async def get_current_profile():
     }
 
 
-def load_chat_history() -> List[dict]:
-    """Load chat history from file"""
-    if CHAT_HISTORY_FILE.exists():
-        try:
-            with open(CHAT_HISTORY_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception:
-            return []
-    return []
+async def load_chat_history() -> List[dict]:
+    """Load full chat history (JSONL store)"""
+    return await chat_history_store.load()
+
 
+def _extract_user_message(request: ChatRequest) -> str:
+    """Letzte Nachricht aus messages oder dem (deprecated) message-Feld"""
+    if request.messages and len(request.messages) > 0:
+        # Use last message from messages array
+        return request.messages[-1].content
+    if request.message:
+        # Use deprecated message field
+        return request.message
+    raise HTTPException(status_code=400, detail="No message provided")
 
-def save_chat_history(chat_history: List[dict]):
-    """Save chat history to file"""
+
+async def _fetch_contexts(agent: ProfileAgent, user_message_text: str) -> Dict[str, str]:
+    """Web-Contexts für @tags; Fehler blockieren den Chat nicht"""
+    try:
+        fetched = await agent.get_contexts_for_prompt(user_message_text)
+        if fetched:
+            print(f"Fetched {len(fetched)} web contexts for message")
+        return fetched
+    except Exception as e:
+        print(f"Error fetching web contexts: {e}")
+        # Continue without contexts
+        return {}
+
+
+async def _preload_history() -> None:
     try:
-        CHAT_HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(CHAT_HISTORY_FILE, 'w', encoding='utf-8') as f:
-            json.dump(chat_history, f, ensure_ascii=False, indent=2)
+        await chat_history_store.count()
     except Exception as e:
-        print(f"Error saving chat history: {e}")
+        print(f"Warning: could not preload chat history: {e}")
+
+
+def _enrich_message(user_message_text: str, contexts: Dict[str, str]) -> str:
+    """Stellt die Web-Contexts als Business Context vor die Nachricht"""
+    if not contexts:
+        return user_message_text
+    parts = ["\n\n## Business Context\n"]
+    parts.extend(
+        f"\n### Quelle: {url}\n{content[:2000]}...\n"
+        for url, content in contexts.items()
+    )
+    parts.append("\n\n")
+    parts.append(user_message_text)
+    return "".join(parts)
 
 
 @router.post("/chat/messages", response_model=ChatResponse)
@@ -180,69 +217,40 @@ async def send_message(request: ChatRequest):
     Send a message and get AI response with optional web context via @tags
     """
     try:
-        agent = get_agent()
+        agent = await get_agent()
         
         # Generate session ID if not provided
         session_id = request.session_id or str(uuid.uuid4())
         
-        # Extract message from either format
-        if request.messages and len(request.messages) > 0:
-            # Use last message from messages array
-            user_message_text = request.messages[-1].content
-        elif request.message:
-            # Use deprecated message field
-            user_message_text = request.message
-        else:
-            raise HTTPException(status_code=400, detail="No message provided")
-        
-        # Load chat history
-        chat_history = load_chat_history()
+        user_message_text = _extract_user_message(request)
         
         # Add user message to history
         user_message = {
             "role": "user",
             "content": user_message_text,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             # Persist current profile context with the user prompt for clarity
             "profile": agent.get_current_profile()
         }
-        chat_history.append(user_message)
         
-        # Fetch web contexts if @tags are present
-        contexts = {}
-        try:
-            contexts = await agent.get_contexts_for_prompt(user_message_text)
-            if contexts:
-                print(f"Fetched {len(contexts)} web contexts for message")
-        except Exception as e:
-            print(f"Error fetching web contexts: {e}")
-            # Continue without contexts
+        # Web-Contexts und Verlauf (erster Request liest die Datei) parallel laden;
+        # Profil/Modell kommen ohnehin aus dem In-Memory-Cache
+        async with asyncio.TaskGroup() as tg:
+            contexts_task = tg.create_task(_fetch_contexts(agent, user_message_text))
+            tg.create_task(_preload_history())
+        contexts = contexts_task.result()
         
         # Get AI response
         try:
             # If we have contexts, enrich the message
-            enriched_message = user_message_text
-            if contexts:
-                context_text = "\n\n## Business Context\n"
-                for url, content in contexts.items():
-                    context_text += f"\n### Quelle: {url}\n{content[:2000]}...\n"
-                enriched_message = context_text + "\n\n" + user_message_text
+            enriched_message = _enrich_message(user_message_text, contexts)
 
             # Resolve target model (override > profile > default)
             # Resolve active profile preferring request > persisted > agent state
             active_profile = request.profile or read_persisted_profile() or agent.get_current_profile()
             
-            # Read persisted model if not specified in request
-            model_to_use = request.model
-            if not model_to_use:
-                # Check for persisted model
-                model_file = BACKEND_DIR / "documents" / "current_model.json"
-                if model_file.exists():
-                    try:
-                        model_data = json.loads(model_file.read_text(encoding="utf-8"))
-                        model_to_use = model_data.get("model")
-                    except Exception:
-                        pass
+            # Persisted model (cached) if not specified in request
+            model_to_use = request.model or read_persisted_model()
 
             response_text = await agent.run(
                 enriched_message,
@@ -264,33 +272,35 @@ async def send_message(request: ChatRequest):
             model_used = "error"
             provider_used = "error"
         
+        # Zeitpunkt der Antwort: einmal erzeugen, für Verlauf und Response verwenden
+        response_ts = datetime.now(timezone.utc).isoformat()
+        
         # Add assistant message to history
         assistant_message = {
             "role": "assistant",
             "content": response_text,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": response_ts,
             "profile": active_profile,
             "model": model_used,
             "provider": provider_used
         }
-        chat_history.append(assistant_message)
         
-        # Save updated history
-        save_chat_history(chat_history)
+        # Append both turns (no full-history rewrite)
+        await chat_history_store.append(user_message, assistant_message)
         
         # Get rate limits from provider if available
         rate_limits_data = {}
         if hasattr(agent, 'last_response_metadata') and agent.last_response_metadata:
             rate_limits_data = agent.last_response_metadata.get('rate_limits', {})
         
-        return ChatResponse(
+        return ChatResponse.model_construct(
             response=response_text,
             session_id=session_id,
             model=model_used,
             profile=active_profile or "default",
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=response_ts,
             metadata={
-                "message_count": len(chat_history),
+                "message_count": await chat_history_store.count(),
                 "provider": provider_used,
                 "rate_limits": rate_limits_data
             }
@@ -300,34 +310,116 @@ async def send_message(request: ChatRequest):
         raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
 
 
+@router.post("/chat/messages/stream")
+async def stream_message(request: ChatRequest):
+    """
+    Wie /chat/messages, aber die Antwort kommt als NDJSON-Stream
+    - Zeilen {"delta": "..."} sobald der Provider Tokens liefert
+    - Abschluss {"done": true, ...} mit Modell/Provider/Profil, danach wird der Verlauf gespeichert
+    - Fehler nach Stream-Start als {"error": "..."} (Status ist dann bereits gesendet)
+    """
+    agent = await get_agent()
+    session_id = request.session_id or str(uuid.uuid4())
+    user_message_text = _extract_user_message(request)
+    
+    user_message = {
+        "role": "user",
+        "content": user_message_text,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "profile": agent.get_current_profile()
+    }
+    
+    async with asyncio.TaskGroup() as tg:
+        contexts_task = tg.create_task(_fetch_contexts(agent, user_message_text))
+        tg.create_task(_preload_history())
+    enriched_message = _enrich_message(user_message_text, contexts_task.result())
+    
+    active_profile = request.profile or read_persisted_profile() or agent.get_current_profile()
+    model_to_use = request.model or read_persisted_model()
+    
+    async def lines():
+        chunks: List[str] = []
+        try:
+            async for chunk in agent.run_stream(
+                enriched_message,
+                profile_name=active_profile,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens,
+                model=model_to_use,
+            ):
+                chunks.append(chunk)
+                yield orjson.dumps({"delta": chunk}) + b"\n"
+        except Exception as e:
+            print(f"Error in agent.run_stream: {e}")
+            yield orjson.dumps({"error": str(e)}) + b"\n"
+            return
+        
+        response_ts = datetime.now(timezone.utc).isoformat()
+        model_used = agent.last_model_used or "unknown"
+        provider_used = agent.last_provider_used or "lokal"
+        await chat_history_store.append(user_message, {
+            "role": "assistant",
+            "content": "".join(chunks),
+            "timestamp": response_ts,
+            "profile": active_profile,
+            "model": model_used,
+            "provider": provider_used
+        })
+        yield orjson.dumps({
+            "done": True,
+            "session_id": session_id,
+            "model": model_used,
+            "provider": provider_used,
+            "profile": active_profile or "default",
+            "timestamp": response_ts,
+        }) + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.get("/chat/sessions", response_model=ChatSessionList)
-async def get_sessions():
+async def get_sessions(include_archive: bool = False):
     """
     Get list of chat sessions
-    For now, returns a single session with full history
+    For now, returns a single session with the active history
+    (include_archive=true: inkl. archivierter Nachrichten, ungecacht)
     """
-    chat_history = load_chat_history()
+    global _sessions_cache
+    await chat_history_store.count()  # Verlauf ggf. einmalig laden, damit version stimmt
+    version = chat_history_store.version
+    if not include_archive and _sessions_cache is not None and _sessions_cache[0] == version:
+        return Response(content=_sessions_cache[1], media_type="application/json")
     
-    if not chat_history:
-        return ChatSessionList(sessions=[], total=0)
-    
-    messages = [
-        ChatMessage(
-            role=msg["role"],
-            content=msg["content"],
-            timestamp=msg.get("timestamp")
-        )
-        for msg in chat_history
-    ]
+    chat_history = await load_chat_history()
+    if include_archive:
+        chat_history = [msg async for msg in chat_history_store.iter_archived()] + chat_history
     
-    session = ChatSession(
-        session_id="default",
-        messages=messages,
-        created_at=messages[0].timestamp if messages else datetime.utcnow().isoformat(),
-        updated_at=messages[-1].timestamp if messages else datetime.utcnow().isoformat()
-    )
+    if not chat_history:
+        body = orjson.dumps({"sessions": [], "total": 0})
+    else:
+        # Verlauf ist bereits validiert gespeichert -> Dicts direkt serialisieren,
+        # ohne ChatMessage/ChatSession-Modelle pro Nachricht aufzubauen
+        messages = [
+            {
+                "role": msg["role"],
+                "content": msg["content"],
+                "timestamp": msg.get("timestamp")
+            }
+            for msg in chat_history
+        ]
+        now = datetime.now(timezone.utc).isoformat()
+        
+        session = {
+            "session_id": "default",
+            "messages": messages,
+            "created_at": messages[0]["timestamp"] or now,
+            "updated_at": messages[-1]["timestamp"] or now
+        }
+        body = orjson.dumps({"sessions": [session], "total": 1})
     
-    return ChatSessionList(sessions=[session], total=1)
+    if not include_archive:
+        _sessions_cache = (version, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.delete("/chat/sessions/{session_id}")
@@ -337,7 +429,7 @@ async def delete_session(session_id: str):
     For now, clears all history
     """
     try:
-        save_chat_history([])
+        await chat_history_store.clear()
         return {"message": "Chat history cleared", "session_id": session_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting session: {str(e)}")
@@ -349,7 +441,7 @@ async def clear_all_sessions():
     Clear all chat sessions
     """
     try:
-        save_chat_history([])
+        await chat_history_store.clear()
         return {"message": "All chat history cleared"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error clearing sessions: {str(e)}")
@@ -360,8 +452,21 @@ async def get_history():
     """
     Get chat history (simplified endpoint for frontend)
     """
-    chat_history = load_chat_history()
-    return {"history": chat_history}
+    chat_history = await load_chat_history()
+    return ORJSONResponse({"history": chat_history})
+
+
+@router.get("/history/stream")
+async def stream_history():
+    """
+    Stream chat history as NDJSON (eine Nachricht pro Zeile)
+    Für große Verläufe: das Frontend kann inkrementell rendern, ohne das ganze JSON-Dokument aufzubauen
+    """
+    async def lines():
+        async for msg in chat_history_store.iter_messages():
+            yield orjson.dumps(msg) + b"\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.delete("/history")
@@ -370,11 +475,11 @@ async def clear_history():
     Clear chat history (simplified endpoint for frontend)
     """
     try:
-        save_chat_history([])
+        await chat_history_store.clear()
         
         # Reset agent conversation history (but keep MCP context)
         try:
-            agent = get_agent()
+            agent = await get_agent()
             if hasattr(agent, 'conversation_history'):
                 agent.conversation_history = []
         except Exception as e:
@@ -388,25 +493,18 @@ async def clear_history():
 @router.delete("/history/{provider}/{profile}")
 async def clear_history_for_context(provider: str, profile: str):
     """
-    Delete chat history entries for a specific provider + profile combination.
-    Keeps other conversations intact.
+    Delete chat history entries for a specific provider + profile combination
+    (active history and archives). Keeps other conversations intact.
     """
     try:
-        history = load_chat_history()
-        before = len(history)
-        filtered = [
-            msg for msg in history
-            if not (
-                msg.get("profile") == profile and
-                (msg.get("provider") == provider or not msg.get("provider"))
-            )
-        ]
-        removed = before - len(filtered)
-        save_chat_history(filtered)
+        removed = await chat_history_store.remove_where(
+            lambda msg: msg.get("profile") == profile and
+            (msg.get("provider") == provider or not msg.get("provider"))
+        )
 
         # Reset agent conversation history (but keep MCP context)
         try:
-            agent = get_agent()
+            agent = await get_agent()
             if hasattr(agent, 'conversation_history'):
                 agent.conversation_history = []
         except Exception as e:
@@ -7,21 +7,26 @@ Configuration and profile management endpoints
 from fastapi import APIRouter, HTTPException
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
-import sys
-import json
 from pathlib import Path
 import os
+import threading
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
-
+from backend.api.responses import ORJSONResponse
 from backend.api.v1.models import ModelInfo, ProfileInfo, CurrentConfig, ServerConfig
+from backend.core.json_cache import load_json
 from backend.core.model_registry import ModelRegistry
+from backend.core.provider_manager import get_provider_manager
 
 router = APIRouter()
 
+BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+PROFILES_CONFIG_FILE = BACKEND_DIR / "config" / "profiles_kiff.json"
+SERVERS_CONFIG_FILE = BACKEND_DIR / "config" / "servers_kiff.json"
+
 
 # Provider-related Pydantic models
 class ProviderInfo(BaseModel):
+    """Provider-Informationen"""
     name: str
     display_name: str
     type: str
@@ -35,24 +40,39 @@ class ProviderInfo(BaseModel):
 
 
 class ProviderValidateRequest(BaseModel):
+    """Request für Provider-Validierung"""
     api_key: Optional[str] = None
 
 
 class ProviderValidateResponse(BaseModel):
+    """Response für Provider-Validierung"""
     valid: bool
     message: str
     details: Optional[Dict[str, Any]] = None
 
 
+class CurrentProviderResponse(BaseModel):
+    """Aktueller Provider Status"""
+    provider: str
+    profile: str
+    model: str
+    provider_display_name: str
+    profile_display_name: str
+    model_short_name: str
+
+
 # Global registry instance
 _model_registry = None
+_model_registry_lock = threading.Lock()
 
 
 def get_model_registry():
-    """Get or create model registry instance"""
+    """Get or create model registry instance (thread-safe, double-checked)"""
     global _model_registry
     if _model_registry is None:
-        _model_registry = ModelRegistry()
+        with _model_registry_lock:
+            if _model_registry is None:
+                _model_registry = ModelRegistry()
     return _model_registry
 
 
@@ -69,15 +89,16 @@ async def get_models():
         details = registry.get_model_details(model_name)
         model_config = registry.config.get("models", {}).get(model_name, {})
         
-        models.append(ModelInfo(
-            name=model_name,
-            display_name=details,
-            path=model_config.get("path", ""),
-            context_length=model_config.get("context_length", 2048),
-            parameters=model_config.get("parameters", {})
-        ))
+        models.append({
+            "name": model_name,
+            "display_name": details,
+            "path": model_config.get("path", ""),
+            "context_length": model_config.get("context_length", 2048),
+            "parameters": model_config.get("parameters", {})
+        })
     
-    return models
+    # Daten stammen aus der eigenen Konfiguration -> ohne response_model-Validierung ausliefern
+    return ORJSONResponse(models)
 
 
 @router.get("/config/profiles", response_model=List[ProfileInfo])
@@ -85,26 +106,23 @@ async def get_profiles():
     """
     Get list of available agent profiles
     """
-    config_path = Path("config/profiles_kiff.json")
-    
-    if not config_path.exists():
+    if not PROFILES_CONFIG_FILE.exists():
         return []
     
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            profiles_config = json.load(f)
+        profiles_config = load_json(PROFILES_CONFIG_FILE)
         
         profiles = []
         for profile_name, profile_data in profiles_config.items():
-            profiles.append(ProfileInfo(
-                name=profile_name,
-                display_name=profile_data.get("display_name", profile_name),
-                description=profile_data.get("description"),
-                system_prompt=profile_data.get("system_prompt"),
-                parameters=profile_data.get("parameters", {})
-            ))
+            profiles.append({
+                "name": profile_name,
+                "display_name": profile_data.get("display_name", profile_name),
+                "description": profile_data.get("description"),
+                "system_prompt": profile_data.get("system_prompt"),
+                "parameters": profile_data.get("parameters", {})
+            })
         
-        return profiles
+        return ORJSONResponse(profiles)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load profiles: {str(e)}")
 
@@ -118,15 +136,8 @@ async def get_current_config():
     current_model = registry.get_default_model()
 
     # Determine current profile from persisted state if available
-    current_profile = "general_chat"
-    try:
-        backend_dir = Path(__file__).resolve().parent.parent.parent
-        profile_file = backend_dir / "documents" / "current_profile.json"
-        if profile_file.exists():
-            data = json.loads(profile_file.read_text(encoding="utf-8"))
-            current_profile = data.get("profile", "general_chat")
-    except Exception:
-        pass
+    from backend.api.v1.chat import read_persisted_profile
+    current_profile = read_persisted_profile()
 
     # Reflect actual LLM server URL from environment
     llm_server_url = os.getenv("LLM_SERVER_URL", "http://localhost:11434")
@@ -148,14 +159,11 @@ async def get_server_config():
     """
     Get server configuration
     """
-    config_path = Path("config/servers_kiff.json")
-    
-    if not config_path.exists():
+    if not SERVERS_CONFIG_FILE.exists():
         raise HTTPException(status_code=404, detail="Server config not found")
     
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json(SERVERS_CONFIG_FILE)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load server config: {str(e)}")
 
@@ -177,45 +185,6 @@ async def get_profiles_alias():
 # Provider Management Endpoints
 # ========================================
 
-from backend.core.provider_manager import get_provider_manager
-from pydantic import BaseModel
-
-
-class ProviderValidateRequest(BaseModel):
-    """Request für Provider-Validierung"""
-    api_key: Optional[str] = None
-
-
-class ProviderValidateResponse(BaseModel):
-    """Response für Provider-Validierung"""
-    valid: bool
-    message: str
-    details: Optional[dict] = None
-
-
-class ProviderInfo(BaseModel):
-    """Provider-Informationen"""
-    name: str
-    display_name: str
-    type: str
-    enabled: bool
-    description: str
-    requires_api_key: bool
-    has_api_key: bool
-    is_current: bool
-    features: dict
-    rate_limits: dict
-
-
-class CurrentProviderResponse(BaseModel):
-    """Aktueller Provider Status"""
-    provider: str
-    profile: str
-    model: str
-    provider_display_name: str
-    profile_display_name: str
-    model_short_name: str
-
 
 @router.get("/providers", response_model=List[ProviderInfo])
 async def get_providers():
@@ -226,9 +195,9 @@ async def get_providers():
         List of providers with status and capabilities
     """
     manager = get_provider_manager()
-    providers = manager.get_available_providers()
     
-    return [ProviderInfo(**p) for p in providers]
+    # get_available_providers liefert bereits genau die ProviderInfo-Felder
+    return ORJSONResponse(manager.get_available_providers())
 
 
 @router.post("/provider/{provider_name}/validate", response_model=ProviderValidateResponse)
@@ -304,7 +273,7 @@ async def get_profile_models(profile_name: str, provider: Optional[str] = None):
     supported_model_ids = agent.get_models_for_profile(profile_name, provider_name)
     
     if not supported_model_ids:
-        return {"profile": profile_name, "provider": provider_name, "models": []}
+        return ORJSONResponse({"profile": profile_name, "provider": provider_name, "models": []})
     
     # Get model details from provider
     provider_inst = manager.get_provider(provider_name)
@@ -313,7 +282,7 @@ async def get_profile_models(profile_name: str, provider: Optional[str] = None):
     # Filter to only supported models
     filtered_models = [m for m in all_models if m.model_id in supported_model_ids]
     
-    return {
+    return ORJSONResponse({
         "profile": profile_name,
         "provider": provider_name,
         "models": [
@@ -329,7 +298,7 @@ async def get_profile_models(profile_name: str, provider: Optional[str] = None):
             }
             for m in filtered_models
         ]
-    }
+    })
 
 
 @router.post("/model/{model_id}/set")
@@ -343,14 +312,11 @@ async def set_model(model_id: str):
     Returns:
         Success message
     """
-    backend_dir = Path(__file__).resolve().parent.parent.parent
-    model_file = backend_dir / "documents" / "current_model.json"
+    from backend.api.v1 import chat as chat_module
     
     try:
-        model_file.write_text(
-            json.dumps({"model": model_id}, indent=2),
-            encoding="utf-8"
-        )
+        # Schreibt die Datei und aktualisiert den gemeinsamen Cache
+        chat_module.current_model_store.set(model_id)
         return {"message": f"Model '{model_id}' set as current", "model": model_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to set model: {str(e)}")
@@ -359,60 +325,41 @@ async def set_model(model_id: str):
 @router.get("/provider/current")
 async def get_current_provider():
     """Get current active provider, profile, and model with display names"""
-    from backend.core.provider_manager import ProviderManager
-    from backend.core.profile_agent import ProfileAgent
+    from backend.api.v1.chat import get_agent, read_persisted_model, read_persisted_profile
     
-    manager = ProviderManager()
+    manager = get_provider_manager()
     
     # Get current provider
     current_provider_name = manager.get_current_provider_name()
     provider = manager.get_provider(current_provider_name)
     provider_display_name = provider.config.display_name if hasattr(provider, 'config') else current_provider_name
     
-    # Get current profile
-    backend_dir = Path(__file__).resolve().parent.parent.parent
-    profile_file = backend_dir / "documents" / "current_profile.json"
-    current_profile_name = "general_chat"
-    if profile_file.exists():
-        try:
-            profile_data = json.loads(profile_file.read_text(encoding="utf-8"))
-            current_profile_name = profile_data.get("profile", "general_chat")
-        except:
-            pass
+    # Get current profile (mtime-cached in chat module)
+    current_profile_name = read_persisted_profile()
     
     # Get profile display name
-    profiles_path = backend_dir / "config" / "profiles_kiff.json"
     profile_display_name = current_profile_name
-    if profiles_path.exists():
+    if PROFILES_CONFIG_FILE.exists():
         try:
-            profiles_config = json.loads(profiles_path.read_text(encoding="utf-8"))
+            profiles_config = load_json(PROFILES_CONFIG_FILE)
             profile_display_name = profiles_config.get(current_profile_name, {}).get("display_name", current_profile_name)
         except:
             pass
     
-    # Get current model - check persisted model first
-    model_file = backend_dir / "documents" / "current_model.json"
-    current_model = None
-    if model_file.exists():
-        try:
-            model_data = json.loads(model_file.read_text(encoding="utf-8"))
-            current_model = model_data.get("model")
-        except Exception:
-            pass
+    # Get current model - check persisted model first (mtime-cached in chat module)
+    current_model = read_persisted_model()
     
     # Fallback to default model for profile if no persisted model
     if not current_model:
-        agent = ProfileAgent(profile_name=current_profile_name, provider_manager=manager)
+        agent = await get_agent()
         current_model = agent.get_default_model_for_profile(current_profile_name, current_provider_name)
     
-    # Get model short name
+    # Get model short name (Dict-Lookup im Provider)
     model_short_name = current_model
     try:
-        all_models = provider.get_models()
-        for m in all_models:
-            if m.model_id == current_model:
-                model_short_name = m.short_name or m.model_id
-                break
+        model_info = provider.get_model_info(current_model) if current_model else None
+        if model_info:
+            model_short_name = model_info.short_name or model_info.model_id
     except:
         pass
     
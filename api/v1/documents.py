@@ -4,19 +4,25 @@ documents.py
 Document management endpoints
 """
 
-import json
-import sys
+import asyncio
+import bisect
+import heapq
+import os
 import uuid
 import shutil
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime, timezone
 
+import aiofiles
+import httpx
+import orjson
 from fastapi import APIRouter, HTTPException, UploadFile, File
 from fastapi.responses import FileResponse
-import httpx
-from typing import List
 
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+from backend.adapters.http import RETRY_EXCEPTIONS, RETRY_STATUS_CODES, get_http_client
+from backend.api.responses import ORJSONResponse
+from typing import Any, Dict, List, Optional, Tuple
 
 from backend.api.v1.models import (
     DocumentInfo,
@@ -25,7 +31,8 @@ from backend.api.v1.models import (
     DocumentSessionResponse,
     DocumentSessionHistoryResponse,
     DocumentUploadResponse,
-    DocumentVersionInfo,
+    GoogleBatchImportRequest,
+    GoogleBatchImportResponse,
     GoogleImportRequest,
     GoogleExportRequest,
     GoogleExportResponse,
@@ -38,6 +45,254 @@ INPUT_DOCS_PATH = Path("./documents/input")
 OUTPUT_DOCS_PATH = Path("./documents/output")
 SESSIONS_PATH = Path("./documents/sessions")
 
+# Uploads blockweise schreiben; Obergrenze per ENV (MB)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "50")) * 1024 * 1024
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Gemeinsamer Keep-Alive-Pool für Google Docs/Drive (adapters.http, beim Shutdown geschlossen)
+GOOGLE_HTTP_POOL = "google"
+GOOGLE_POOL_SIZE = 8
+
+# Drive-Export: ab dieser Größe resumable Upload in Chunks (Chunk-Größe muss Vielfaches von 256 KiB sein)
+DRIVE_RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+DRIVE_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+DRIVE_UPLOAD_URL = "https://www.googleapis.com/upload/drive/v3/files"
+DRIVE_CHUNK_ATTEMPTS = 3
+
+# Index der hochgeladenen Dokumente, gültig solange (Verzeichnis, Verzeichnis-mtime) gleich bleibt
+_doc_index_key: Optional[Tuple[Path, int]] = None
+_doc_list: List[Dict[str, Any]] = []
+_doc_by_stem: Dict[str, Dict[str, Any]] = {}
+# Sortierte Dateinamen für Präfix-Suche per bisect
+_doc_names: List[str] = []
+_doc_by_name: Dict[str, Dict[str, Any]] = {}
+
+
+def _copy_upload(src, part_path: Path) -> int:
+    """Kopiert den (bereits gespoolten) Upload blockweise in part_path (läuft im Worker-Thread)"""
+    written = 0
+    with open(part_path, "wb") as out:
+        while chunk := src.read(UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > MAX_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail="File too large")
+            out.write(chunk)
+    return written
+
+
+async def _save_upload(file: UploadFile, destination: Path) -> int:
+    """
+    Schreibt einen Upload blockweise auf die Platte, ohne den Event Loop zu blockieren
+    
+    Der Body ist beim Aufruf schon vollständig gespoolt -> die ganze Kopie läuft in einem
+    Worker-Thread (ein Thread-Wechsel statt zwei pro Block für read + write).
+    Schreibt in eine .part-Datei und ersetzt das Ziel erst am Ende (bestehende Datei bleibt
+    bei Fehlern erhalten). Zu große Uploads werden mit 413 abgelehnt.
+    
+    Returns:
+        Anzahl geschriebener Bytes
+    """
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="File too large")
+    
+    part_path = destination.with_name(destination.name + ".part")
+    try:
+        written = await asyncio.to_thread(_copy_upload, file.file, part_path)
+        os.replace(part_path, destination)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    return written
+
+
+async def _download_to(url: str, destination: Path) -> int:
+    """
+    Lädt eine Datei per Streaming direkt auf die Platte (ohne den Inhalt im Speicher zu halten)
+
+    Gleiche Regeln wie _save_upload: .part-Datei + os.replace, Obergrenze MAX_UPLOAD_BYTES.
+
+    Returns:
+        Anzahl geschriebener Bytes
+    """
+    client = get_http_client(GOOGLE_HTTP_POOL, GOOGLE_POOL_SIZE)
+    part_path = destination.with_name(destination.name + ".part")
+    written = 0
+    try:
+        async with client.stream("GET", url, follow_redirects=True, timeout=30) as response:
+            if response.status_code != 200:
+                raise HTTPException(status_code=400, detail=f"Google Docs download failed (status {response.status_code})")
+            async with aiofiles.open(part_path, "wb") as out:
+                async for chunk in response.aiter_bytes(UPLOAD_CHUNK_SIZE):
+                    written += len(chunk)
+                    if written > MAX_UPLOAD_BYTES:
+                        raise HTTPException(status_code=413, detail="Document too large")
+                    await out.write(chunk)
+        os.replace(part_path, destination)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    return written
+
+
+def _next_offset(response: httpx.Response) -> int:
+    """Nächstes Byte laut Range-Header einer 308-Antwort ("bytes=0-N", fehlt = nichts angekommen)"""
+    received = response.headers.get("Range")
+    return int(received.rsplit("-", 1)[1]) + 1 if received else 0
+
+
+async def _resumable_drive_upload(state_path: Path, size: int, metadata: bytes, headers: Dict[str, str]) -> httpx.Response:
+    """
+    Lädt eine Datei per Drive-Protokoll uploadType=resumable hoch
+
+    Erst Session per POST (Metadaten) anlegen, dann die Datei in DRIVE_UPLOAD_CHUNK_SIZE
+    großen Stücken per PUT mit Content-Range senden. Im Speicher liegt nur ein Chunk.
+    Bei transienten Fehlern wird der Stand beim Server abgefragt und ab dort fortgesetzt.
+
+    Returns:
+        Letzte Response (200/201 bei Erfolg, sonst die Fehlerantwort)
+    """
+    client = get_http_client(GOOGLE_HTTP_POOL, GOOGLE_POOL_SIZE)
+    init = await client.post(
+        f"{DRIVE_UPLOAD_URL}?uploadType=resumable",
+        content=metadata,
+        headers={
+            **headers,
+            "Content-Type": "application/json; charset=UTF-8",
+            "X-Upload-Content-Type": DOCX_MEDIA_TYPE,
+            "X-Upload-Content-Length": str(size),
+        },
+        timeout=30,
+    )
+    session_uri = init.headers.get("Location")
+    if init.status_code != 200 or not session_uri:
+        return init
+
+    offset = 0
+    failures = 0
+    async with aiofiles.open(state_path, "rb") as f:
+        while True:
+            await f.seek(offset)
+            chunk = await f.read(DRIVE_UPLOAD_CHUNK_SIZE)
+            end = offset + len(chunk) - 1
+            try:
+                response = await client.put(
+                    session_uri,
+                    content=chunk,
+                    headers={**headers, "Content-Range": f"bytes {offset}-{end}/{size}"},
+                    timeout=60,
+                )
+            except RETRY_EXCEPTIONS:
+                response = None
+
+            if response is not None and response.status_code == 308:
+                offset = _next_offset(response)
+                failures = 0
+                continue
+            if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                return response
+
+            # Transienter Fehler: Stand beim Server erfragen statt alles neu zu senden
+            failures += 1
+            if failures >= DRIVE_CHUNK_ATTEMPTS:
+                if response is None:
+                    raise HTTPException(status_code=502, detail="Google Drive upload interrupted")
+                return response
+            status = await client.put(
+                session_uri,
+                headers={**headers, "Content-Range": f"bytes */{size}"},
+                timeout=30,
+            )
+            if status.status_code != 308:
+                return status
+            offset = _next_offset(status)
+
+
+def _snapshot_file(src: Path, dst: Path) -> None:
+    """
+    Sichert src unter dst ohne Daten zu kopieren (Hardlink)
+
+    Der Session-Stand wird nie in-place geändert, sondern per os.replace ersetzt
+    (_save_upload) -> der Hardlink behält den alten Inhalt. Fallback auf eine Kopie,
+    wenn das Dateisystem keine Hardlinks kann (shutil nutzt unter Linux sendfile).
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _doc_entry(path: str, name: str, stat: os.stat_result) -> Dict[str, Any]:
+    """DocumentInfo-Felder für eine Datei"""
+    return {
+        "id": os.path.splitext(name)[0],
+        "filename": name,
+        "path": path,
+        "size": stat.st_size,
+        "mime_type": None,  # TODO: detect mime type
+        "uploaded_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
+        "metadata": {}
+    }
+
+
+def _dir_key() -> Tuple[Path, int]:
+    return (INPUT_DOCS_PATH, INPUT_DOCS_PATH.stat().st_mtime_ns)
+
+
+def _set_doc_index(docs: List[Dict[str, Any]]) -> None:
+    """Index setzen und an den aktuellen Verzeichnisstand (mtime) binden"""
+    global _doc_index_key, _doc_list, _doc_by_stem, _doc_names, _doc_by_name
+    by_stem: Dict[str, Dict[str, Any]] = {}
+    for doc in docs:
+        by_stem.setdefault(doc["id"], doc)
+    _doc_by_name = {doc["filename"]: doc for doc in docs}
+    _doc_names = sorted(_doc_by_name)
+    _doc_list, _doc_by_stem, _doc_index_key = docs, by_stem, _dir_key()
+
+
+def _get_doc_index() -> List[Dict[str, Any]]:
+    """Dokumentliste; das Verzeichnis wird nur nach einer Änderung (mtime) neu eingelesen"""
+    INPUT_DOCS_PATH.mkdir(parents=True, exist_ok=True)
+    if _dir_key() != _doc_index_key:
+        # scandir: DirEntry liefert Typ (und unter Windows stat) direkt aus readdir
+        with os.scandir(INPUT_DOCS_PATH) as it:
+            _set_doc_index([
+                _doc_entry(entry.path, entry.name, entry.stat())
+                for entry in it
+                if entry.is_file(follow_symlinks=False) and not entry.name.endswith(".part")
+            ])
+    return _doc_list
+
+
+def _index_add(file_path: Path) -> None:
+    """Neu geschriebene Datei in den Index übernehmen (ohne Neu-Einlesen)"""
+    if _doc_index_key is None or _doc_index_key[0] != INPUT_DOCS_PATH:
+        return
+    docs = [d for d in _doc_list if d["filename"] != file_path.name]
+    docs.append(_doc_entry(str(file_path), file_path.name, file_path.stat()))
+    _set_doc_index(docs)
+
+
+def _index_remove(filename: str) -> None:
+    """Gelöschte Datei aus dem Index entfernen"""
+    if _doc_index_key is None or _doc_index_key[0] != INPUT_DOCS_PATH:
+        return
+    _set_doc_index([d for d in _doc_list if d["filename"] != filename])
+
+
+def _find_document(document_id: str) -> Optional[Dict[str, Any]]:
+    """Dokument per ID (Dateiname ohne Endung) oder Präfix des Dateinamens"""
+    _get_doc_index()
+    doc = _doc_by_stem.get(document_id)
+    if doc is not None:
+        return doc
+    # Erster Dateiname >= document_id ist der einzige Kandidat für einen Präfix-Treffer
+    i = bisect.bisect_left(_doc_names, document_id)
+    if i < len(_doc_names) and _doc_names[i].startswith(document_id):
+        return _doc_by_name[_doc_names[i]]
+    return None
+
 
 def _ensure_session(session_id: str) -> Path:
     session_dir = SESSIONS_PATH / session_id
@@ -51,24 +306,8 @@ async def list_documents():
     """
     Get list of uploaded documents
     """
-    INPUT_DOCS_PATH.mkdir(parents=True, exist_ok=True)
-    
-    documents = []
-    
-    for file_path in INPUT_DOCS_PATH.iterdir():
-        if file_path.is_file():
-            stat = file_path.stat()
-            documents.append(DocumentInfo(
-                id=file_path.stem,
-                filename=file_path.name,
-                path=str(file_path),
-                size=stat.st_size,
-                mime_type=None,  # TODO: detect mime type
-                uploaded_at=datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                metadata={}
-            ))
-    
-    return DocumentList(documents=documents, total=len(documents))
+    documents = _get_doc_index()
+    return ORJSONResponse({"documents": documents, "total": len(documents)})
 
 
 @router.post("/documents", response_model=DocumentUploadResponse)
@@ -84,15 +323,17 @@ async def upload_document(file: UploadFile = File(...)):
         
         # Save file
         file_path = INPUT_DOCS_PATH / file.filename
-        with open(file_path, 'wb') as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        await _save_upload(file, file_path)
+        _index_add(file_path)
         
-        return DocumentUploadResponse(
+        return DocumentUploadResponse.model_construct(
             id=doc_id,
             filename=file.filename,
             message=f"Document '{file.filename}' uploaded successfully"
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
@@ -113,17 +354,19 @@ async def upload_document_session(file: UploadFile = File(...)):
         state_path = session_dir / "state.docx"
         meta_path = session_dir / "meta.json"
 
-        with open(state_path, "wb") as destination:
-            shutil.copyfileobj(file.file, destination)
+        await _save_upload(file, state_path)
 
         meta = {"original_filename": original_filename}
-        meta_path.write_text(json.dumps(meta))
+        meta_path.write_bytes(orjson.dumps(meta))
 
-        return DocumentSessionResponse(
+        return DocumentSessionResponse.model_construct(
             session_id=session_id,
             filename=original_filename,
             message="Session created and document stored",
         )
+    except HTTPException:
+        await asyncio.to_thread(shutil.rmtree, session_dir, ignore_errors=True)
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Session upload failed: {str(e)}")
 
@@ -135,13 +378,16 @@ async def delete_document(document_id: str):
     """
     try:
         # Find and delete file
-        for file_path in INPUT_DOCS_PATH.iterdir():
-            if file_path.stem == document_id or file_path.name.startswith(document_id):
-                file_path.unlink()
-                return {"message": f"Document deleted", "id": document_id}
+        doc = _find_document(document_id)
+        if doc is None:
+            raise HTTPException(status_code=404, detail="Document not found")
         
-        raise HTTPException(status_code=404, detail="Document not found")
+        Path(doc["path"]).unlink()
+        _index_remove(doc["filename"])
+        return {"message": f"Document deleted", "id": document_id}
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Delete failed: {str(e)}")
 
@@ -151,20 +397,12 @@ async def get_document(document_id: str):
     """
     Get document information by ID
     """
-    for file_path in INPUT_DOCS_PATH.iterdir():
-        if file_path.stem == document_id or file_path.name.startswith(document_id):
-            stat = file_path.stat()
-            return DocumentInfo(
-                id=document_id,
-                filename=file_path.name,
-                path=str(file_path),
-                size=stat.st_size,
-                mime_type=None,
-                uploaded_at=datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                metadata={}
-            )
+    doc = _find_document(document_id)
+    if doc is None:
+        raise HTTPException(status_code=404, detail="Document not found")
     
-    raise HTTPException(status_code=404, detail="Document not found")
+    # Felder stammen aus dem eigenen Index -> ohne erneute Validierung
+    return DocumentInfo.model_construct(**{**doc, "id": document_id})
 
 
 @router.get("/documents/session/{session_id}/export")
@@ -174,21 +412,23 @@ async def export_document_session(session_id: str):
     state_path = session_dir / "state.docx"
     meta_path = session_dir / "meta.json"
 
-    if not state_path.exists():
+    # Ein stat() für Existenz-Check und Content-Length (FileResponse stat't sonst erneut)
+    try:
+        state_stat = state_path.stat()
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Session or document not found")
 
     filename = "export.docx"
-    if meta_path.exists():
-        try:
-            meta = json.loads(meta_path.read_text())
-            original = meta.get("original_filename")
-            if original:
-                filename = f"edited-{original}"
-        except Exception:
-            # If metadata is unreadable, fall back to default filename
-            pass
+    try:
+        meta = orjson.loads(meta_path.read_bytes())
+        original = meta.get("original_filename")
+        if original:
+            filename = f"edited-{original}"
+    except Exception:
+        # If metadata is missing or unreadable, fall back to default filename
+        pass
 
-    return FileResponse(path=state_path, media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document", filename=filename)
+    return FileResponse(path=state_path, stat_result=state_stat, media_type=DOCX_MEDIA_TYPE, filename=filename)
 
 
 @router.post("/documents/session/{session_id}/apply", response_model=DocumentSessionMessage)
@@ -206,37 +446,48 @@ async def apply_document_session(session_id: str, file: UploadFile = File(...)):
 
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
         backup_path = history_dir / f"state-{timestamp}.docx"
-        shutil.copy2(state_path, backup_path)
+        await asyncio.to_thread(_snapshot_file, state_path, backup_path)
 
-        with open(state_path, "wb") as destination:
-            shutil.copyfileobj(file.file, destination)
+        await _save_upload(file, state_path)
 
-        return DocumentSessionMessage(session_id=session_id, message="Session updated; previous version archived")
+        return DocumentSessionMessage.model_construct(session_id=session_id, message="Session updated; previous version archived")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Apply failed: {str(e)}")
 
 
 @router.get("/documents/session/{session_id}/history", response_model=DocumentSessionHistoryResponse)
-async def history_document_session(session_id: str):
-    """List saved history versions for a session"""
+async def history_document_session(session_id: str, limit: Optional[int] = None):
+    """List saved history versions for a session (newest first, optional limit)"""
     session_dir = _ensure_session(session_id)
     history_dir = session_dir / "history"
 
-    versions: list[DocumentVersionInfo] = []
-    if history_dir.exists():
-        for file_path in sorted(history_dir.iterdir(), reverse=True):
-            if file_path.is_file():
-                stat = file_path.stat()
-                versions.append(
-                    DocumentVersionInfo(
-                        version_id=file_path.stem,
-                        filename=file_path.name,
-                        size=stat.st_size,
-                        created_at=datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                    )
-                )
-
-    return DocumentSessionHistoryResponse(session_id=session_id, versions=versions)
+    # Ein scandir-Durchlauf liefert Name + stat, sortiert wird nur über die Namen (Zeitstempel)
+    try:
+        with os.scandir(history_dir) as it:
+            entries = [(entry.name, entry.stat()) for entry in it if entry.is_file()]
+    except FileNotFoundError:
+        entries = []
+
+    if limit is not None and limit < len(entries):
+        entries = heapq.nlargest(max(limit, 0), entries, key=itemgetter(0))
+    else:
+        entries.sort(key=itemgetter(0), reverse=True)
+
+    # DocumentVersionInfo-Felder als Dicts, ohne Modell-Validierung pro Version
+    versions = [
+        {
+            "version_id": os.path.splitext(name)[0],
+            "filename": name,
+            "size": stat.st_size,
+            # datetime direkt an orjson, das Formatieren (identisch zu isoformat()) läuft in C
+            "created_at": datetime.fromtimestamp(stat.st_ctime),
+        }
+        for name, stat in entries
+    ]
+
+    return ORJSONResponse({"session_id": session_id, "versions": versions})
 
 
 @router.delete("/documents/session/{session_id}", response_model=DocumentSessionMessage)
@@ -245,19 +496,14 @@ async def delete_document_session(session_id: str):
     session_dir = _ensure_session(session_id)
 
     try:
-        shutil.rmtree(session_dir)
-        return DocumentSessionMessage(session_id=session_id, message="Session removed")
+        await asyncio.to_thread(shutil.rmtree, session_dir)
+        return DocumentSessionMessage.model_construct(session_id=session_id, message="Session removed")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Delete failed: {str(e)}")
 
 
-@router.post("/documents/google/import", response_model=DocumentSessionResponse)
-async def import_google_doc(payload: GoogleImportRequest):
-    """Import a Google Doc (public or authorized) as DOCX and start a session"""
-    doc_id = payload.doc_id.strip()
-    if not doc_id:
-        raise HTTPException(status_code=400, detail="doc_id is required")
-
+async def _import_google_doc(doc_id: str) -> DocumentSessionResponse:
+    """Lädt ein Google Doc als DOCX in eine neue Session (bei Fehlern wird die Session entfernt)"""
     url = f"https://docs.google.com/document/d/{doc_id}/export?format=docx"
     session_id = str(uuid.uuid4())
     session_dir = SESSIONS_PATH / session_id
@@ -267,29 +513,66 @@ async def import_google_doc(payload: GoogleImportRequest):
     meta_path = session_dir / "meta.json"
 
     try:
-        with httpx.Client(follow_redirects=True, timeout=30) as client:
-            response = client.get(url)
-            if response.status_code != 200:
-                raise HTTPException(status_code=400, detail=f"Google Docs download failed (status {response.status_code})")
-            state_path.write_bytes(response.content)
+        await _download_to(url, state_path)
 
         meta = {"original_filename": f"gdoc-{doc_id}.docx", "source": "google_doc", "doc_id": doc_id}
-        meta_path.write_text(json.dumps(meta))
+        meta_path.write_bytes(orjson.dumps(meta))
 
-        return DocumentSessionResponse(
+        return DocumentSessionResponse.model_construct(
             session_id=session_id,
             filename=f"gdoc-{doc_id}.docx",
             message="Google Doc import successful; session created",
         )
     except HTTPException:
+        await asyncio.to_thread(shutil.rmtree, session_dir, ignore_errors=True)
         raise
     except Exception as e:
+        await asyncio.to_thread(shutil.rmtree, session_dir, ignore_errors=True)
         raise HTTPException(status_code=500, detail=f"Google import failed: {str(e)}")
 
 
+@router.post("/documents/google/import", response_model=DocumentSessionResponse)
+async def import_google_doc(payload: GoogleImportRequest):
+    """Import a Google Doc (public or authorized) as DOCX and start a session"""
+    doc_id = payload.doc_id.strip()
+    if not doc_id:
+        raise HTTPException(status_code=400, detail="doc_id is required")
+
+    return await _import_google_doc(doc_id)
+
+
+@router.post("/documents/google/import/batch", response_model=GoogleBatchImportResponse)
+async def import_google_docs_batch(payload: GoogleBatchImportRequest):
+    """Import several Google Docs concurrently (one session per document, failures reported per doc)"""
+    doc_ids = list(dict.fromkeys(d.strip() for d in payload.doc_ids if d.strip()))
+    if not doc_ids:
+        raise HTTPException(status_code=400, detail="doc_ids is required")
+
+    # Nicht mehr gleichzeitige Downloads als Verbindungen im Pool
+    semaphore = asyncio.Semaphore(GOOGLE_POOL_SIZE)
+
+    async def import_one(doc_id: str) -> DocumentSessionResponse:
+        async with semaphore:
+            return await _import_google_doc(doc_id)
+
+    results = await asyncio.gather(*(import_one(doc_id) for doc_id in doc_ids), return_exceptions=True)
+
+    sessions: List[DocumentSessionResponse] = []
+    errors: List[Dict[str, Any]] = []
+    for doc_id, result in zip(doc_ids, results):
+        if isinstance(result, HTTPException):
+            errors.append({"doc_id": doc_id, "status_code": result.status_code, "detail": str(result.detail)})
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            sessions.append(result)
+
+    return GoogleBatchImportResponse(sessions=sessions, errors=errors)
+
+
 @router.post("/documents/google/export/{session_id}", response_model=GoogleExportResponse)
 async def export_google_doc(session_id: str, payload: GoogleExportRequest):
-    """Export a session DOCX to Google Drive via simple upload (requires access_token)"""
+    """Export a session DOCX to Google Drive (multipart, resumable for large files; requires access_token)"""
     session_dir = _ensure_session(session_id)
     state_path = session_dir / "state.docx"
     meta_path = session_dir / "meta.json"
@@ -304,44 +587,46 @@ async def export_google_doc(session_id: str, payload: GoogleExportRequest):
     filename = payload.name or "edited-document.docx"
     if meta_path.exists() and not payload.name:
         try:
-            meta = json.loads(meta_path.read_text())
+            meta = orjson.loads(meta_path.read_bytes())
             original = meta.get("original_filename")
             if original:
                 filename = f"edited-{original}"
         except Exception:
             pass
 
-    files = {
-        "metadata": (
-            None,
-            json.dumps({"name": filename, **({"parents": [payload.folder_id]} if payload.folder_id else {})}),
-            "application/json",
-        ),
-        "file": (filename, state_path.read_bytes(), "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
-    }
-
+    metadata = orjson.dumps({"name": filename, **({"parents": [payload.folder_id]} if payload.folder_id else {})})
     headers = {"Authorization": f"Bearer {access_token}"}
 
-    upload_url = "https://www.googleapis.com/upload/drive/v3/files?uploadType=multipart"
-
     try:
-        with httpx.Client(timeout=60) as client:
-            response = client.post(upload_url, headers=headers, files=files)
-            if response.status_code not in (200, 201):
-                detail = response.text[:500]
-                raise HTTPException(status_code=400, detail=f"Google Drive upload failed: {detail}")
-
-            data = response.json()
-            file_id = data.get("id")
-            if not file_id:
-                raise HTTPException(status_code=500, detail="Google Drive response missing file id")
-
-            return GoogleExportResponse(
-                session_id=session_id,
-                file_id=file_id,
-                name=filename,
-                message="Uploaded to Google Drive",
-            )
+        size = state_path.stat().st_size
+        if size > DRIVE_RESUMABLE_THRESHOLD:
+            response = await _resumable_drive_upload(state_path, size, metadata, headers)
+        else:
+            # Datei-Handle statt Bytes: httpx liest den Multipart-Body blockweise von der Platte
+            with open(state_path, "rb") as state_file:
+                files = {
+                    "metadata": (None, metadata, "application/json"),
+                    "file": (filename, state_file, DOCX_MEDIA_TYPE),
+                }
+                response = await get_http_client(GOOGLE_HTTP_POOL, GOOGLE_POOL_SIZE).post(
+                    f"{DRIVE_UPLOAD_URL}?uploadType=multipart", headers=headers, files=files, timeout=60
+                )
+
+        if response.status_code not in (200, 201):
+            detail = response.text[:500]
+            raise HTTPException(status_code=400, detail=f"Google Drive upload failed: {detail}")
+
+        data = response.json()
+        file_id = data.get("id")
+        if not file_id:
+            raise HTTPException(status_code=500, detail="Google Drive response missing file id")
+
+        return GoogleExportResponse.model_construct(
+            session_id=session_id,
+            file_id=file_id,
+            name=filename,
+            message="Uploaded to Google Drive",
+        )
     except HTTPException:
         raise
     except Exception as e:
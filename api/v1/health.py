@@ -6,10 +6,10 @@ Health check and status endpoints
 
 from fastapi import APIRouter
 from datetime import datetime
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+import asyncio
+import threading
+import time
+from typing import Tuple
 
 from backend.api.v1.models import HealthResponse, StatusResponse, ServiceStatus
 from backend.core.server_manager import ServerManager
@@ -18,27 +18,53 @@ router = APIRouter()
 
 # Global server manager instance
 _server_manager = None
+_server_manager_lock = threading.Lock()
+
+# Wird vom Ollama-Startup-Task in main.lifespan gesetzt
+ollama_ready = False
+
+# Ergebnis des LLM-Server-Health-Checks (healthy, Zeitpunkt); /status-Polling teilt sich einen Check
+LLM_HEALTH_TTL = 1.0
+_llm_health: Tuple[bool, float] = (False, 0.0)
+_llm_health_lock = asyncio.Lock()
 
 
 def get_server_manager():
-    """Get or create server manager instance"""
+    """Get or create server manager instance (thread-safe, double-checked)"""
     global _server_manager
     if _server_manager is None:
-        _server_manager = ServerManager()
+        with _server_manager_lock:
+            if _server_manager is None:
+                _server_manager = ServerManager()
     return _server_manager
 
 
+async def llm_server_healthy() -> bool:
+    """ServerManager.is_healthy() mit kurzer TTL; gleichzeitige Aufrufe warten auf denselben Check (im Thread)"""
+    global _llm_health
+    healthy, checked_at = _llm_health
+    if checked_at and time.monotonic() - checked_at < LLM_HEALTH_TTL:
+        return healthy
+    async with _llm_health_lock:
+        healthy, checked_at = _llm_health
+        if checked_at and time.monotonic() - checked_at < LLM_HEALTH_TTL:
+            return healthy
+        healthy = await asyncio.to_thread(get_server_manager().is_healthy)
+        _llm_health = (healthy, time.monotonic())
+        return healthy
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """
     Basic health check endpoint
     Returns overall API health status
     """
-    return HealthResponse(
+    return HealthResponse.model_construct(
         status="healthy",
         timestamp=datetime.utcnow().isoformat(),
         services=[
-            ServiceStatus(
+            ServiceStatus.model_construct(
                 name="api",
                 status="healthy",
                 message="API is running"
@@ -53,25 +79,23 @@ async def detailed_status():
     Detailed status endpoint
     Returns status of all services (API, LLM, MCP)
     """
-    server_manager = get_server_manager()
-    
-    # Check LLM server status
-    llm_healthy = server_manager.is_healthy()
+    # Check LLM server status (cached for LLM_HEALTH_TTL)
+    llm_healthy = await llm_server_healthy()
     
     services = [
-        ServiceStatus(
+        ServiceStatus.model_construct(
             name="api",
             status="healthy",
             message="API server is running",
             details={"version": "1.0.0"}
         ),
-        ServiceStatus(
+        ServiceStatus.model_construct(
             name="llm_server",
             status="healthy" if llm_healthy else "unhealthy",
             message="LLM server is running" if llm_healthy else "LLM server is not responding",
-            details={"url": "http://localhost:8080"}
+            details={"url": "http://localhost:8080", "ollama_ready": ollama_ready}
         ),
-        ServiceStatus(
+        ServiceStatus.model_construct(
             name="mcp_server",
             status="unknown",
             message="MCP server status check not implemented yet",
@@ -79,7 +103,7 @@ async def detailed_status():
         )
     ]
     
-    return StatusResponse(
+    return StatusResponse.model_construct(
         api_version="1.0.0",
         backend_running=True,
         llm_server_running=llm_healthy,
@@ -10,8 +10,7 @@ from fastapi import APIRouter, HTTPException
 from pathlib import Path
 from typing import Dict
 
-from backend.mcp import clear_cache, get_cache_stats, ContextManager
-from backend.mcp.web_context_service import url_to_cache_file
+from backend.mcp import clear_cache, clear_cache_for_urls, get_cache_stats, ContextManager
 
 logger = logging.getLogger(__name__)
 
@@ -93,14 +92,8 @@ async def clear_context_set_cache(context_set: str):
         # Get all URLs for this set
         urls = cm.get_set_urls(context_set)
         
-        # Delete cache files for these URLs
-        deleted_count = 0
-        for url in urls:
-            cache_file = url_to_cache_file(url)
-            if cache_file.exists():
-                cache_file.unlink()
-                deleted_count += 1
-                logger.debug(f"Deleted cache file for {url}")
+        # Delete cache files for these URLs (direkt unlink, ohne exists()-Check pro URL)
+        deleted_count = await clear_cache_for_urls(urls)
         
         logger.info(f"Cleared {deleted_count} cache files for context set '{context_set}'")
         
@@ -128,21 +121,21 @@ async def list_context_sets():
     """
     try:
         cm = get_context_manager()
-        sets = cm.get_available_sets()
+        set_urls = cm.get_all_set_urls()
         
-        set_info = []
-        for set_name in sets:
-            urls = cm.get_set_urls(set_name)
-            set_info.append({
+        set_info = [
+            {
                 "name": set_name,
                 "url_count": len(urls),
                 "urls": urls
-            })
+            }
+            for set_name, urls in set_urls.items()
+        ]
         
         return {
             "status": "success",
             "context_sets": set_info,
-            "total": len(sets)
+            "total": len(set_info)
         }
     except Exception as e:
         logger.error(f"Error listing context sets: {e}")
@@ -2,6 +2,9 @@
 models.py
 
 Pydantic models for API request/response validation
+
+Modelle nur auf Modulebene definieren, nie innerhalb von Handlern: Pydantic baut den
+Validator einmal pro Klasse, eine Klasse pro Request würde ihn jedes Mal neu kompilieren.
 """
 
 from pydantic import BaseModel, Field
@@ -180,6 +183,24 @@ class GoogleImportRequest(BaseModel):
     doc_id: str = Field(..., description="Google Docs file ID")
 
 
+class GoogleBatchImportRequest(BaseModel):
+    """Request to import several Google Docs at once"""
+    doc_ids: List[str] = Field(..., min_length=1, description="Google Docs file IDs")
+
+
+class GoogleImportError(BaseModel):
+    """A failed import inside a batch"""
+    doc_id: str = Field(..., description="Google Docs file ID")
+    status_code: int = Field(..., description="HTTP status the single import would have returned")
+    detail: str = Field(..., description="Error message")
+
+
+class GoogleBatchImportResponse(BaseModel):
+    """Result of a batch import (one session per successful document)"""
+    sessions: List[DocumentSessionResponse] = Field(default_factory=list)
+    errors: List[GoogleImportError] = Field(default_factory=list)
+
+
 class GoogleExportRequest(BaseModel):
     """Request to export a session DOCX to Google Drive"""
     access_token: str = Field(..., description="OAuth2 access token with Drive scope")
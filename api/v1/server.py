@@ -6,13 +6,26 @@ Server Management Endpoints (Simplified for native Ollama)
 - Status-Check prüft Ollama-Erreichbarkeit
 """
 
-import requests
+import asyncio
+import os
+import time
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 
+from backend.adapters.http import OLLAMA_POOL_SIZE, get_http_client
+from backend.api.responses import ORJSONResponse
+
 router = APIRouter()
 
+# Gleiche Ollama-URL wie LLMClient (.env ist beim Import der Router bereits geladen)
+OLLAMA_TAGS_URL = f"{os.getenv('LLM_SERVER_URL', 'http://localhost:11434')}/api/tags"
+
+# Letztes Health-Ergebnis; pollende Frontends teilen sich einen Check pro TTL
+OLLAMA_HEALTH_TTL = 1.5
+_health_cache = {"ts": 0.0, "ok": False}
+_health_lock = asyncio.Lock()
+
 
 class ServerStartRequest(BaseModel):
     model_name: Optional[str] = None
@@ -28,35 +41,48 @@ class ServerStatusResponse(BaseModel):
     current_model: Optional[str]
 
 
-def _check_ollama_health() -> bool:
+async def _check_ollama_health() -> bool:
     """Check if Ollama is reachable"""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=2)
+        # Keep-Alive-Pool: der Status-Check kostet keinen neuen TCP-Handshake
+        response = await get_http_client("ollama", max_connections=OLLAMA_POOL_SIZE).get(OLLAMA_TAGS_URL, timeout=2)
         return response.status_code == 200
     except:
         return False
 
 
-@router.post("/start")
+async def _cached_health(ttl: float = OLLAMA_HEALTH_TTL) -> bool:
+    """_check_ollama_health mit kurzer TTL; gleichzeitige Aufrufe warten auf denselben Check"""
+    if time.monotonic() - _health_cache["ts"] < ttl:
+        return _health_cache["ok"]
+    async with _health_lock:
+        if time.monotonic() - _health_cache["ts"] < ttl:
+            return _health_cache["ok"]
+        ok = await _check_ollama_health()
+        _health_cache.update(ts=time.monotonic(), ok=ok)
+        return ok
+
+
+@router.post("/start", response_class=ORJSONResponse)
 async def start_servers(request: ServerStartRequest):
     """Stub: Ollama läuft nativ (kein Start nötig)"""
-    if _check_ollama_health():
-        return {"message": "Ollama is already running", "model": request.model_name or "mistral-7b"}
+    if await _cached_health():
+        return ORJSONResponse({"message": "Ollama is already running", "model": request.model_name or "mistral-7b"})
     else:
         raise HTTPException(status_code=503, detail="Ollama not reachable. Start 'ollama serve' manually or via task.")
 
 
-@router.post("/stop")
+@router.post("/stop", response_class=ORJSONResponse)
 async def stop_servers():
     """Stub: Ollama läuft nativ (kein Stop über API)"""
-    return {"message": "Ollama runs natively; use 'Stop: All Services' task or kill process manually."}
+    return ORJSONResponse({"message": "Ollama runs natively; use 'Stop: All Services' task or kill process manually."})
 
 
-@router.post("/switch-model")
+@router.post("/switch-model", response_class=ORJSONResponse)
 async def switch_model(request: ServerSwitchRequest):
     """Model switching happens per request via profile selection"""
-    if _check_ollama_health():
-        return {"message": f"Model switching happens via profile selection. Choose profile to use {request.model_name}.", "model": request.model_name}
+    if await _cached_health():
+        return ORJSONResponse({"message": f"Model switching happens via profile selection. Choose profile to use {request.model_name}.", "model": request.model_name})
     else:
         raise HTTPException(status_code=503, detail="Ollama not reachable")
 
@@ -64,8 +90,8 @@ async def switch_model(request: ServerSwitchRequest):
 @router.get("/status", response_model=ServerStatusResponse)
 async def get_server_status():
     """Gibt aktuellen Server-Status zurück"""
-    llama_running = _check_ollama_health()
-    return ServerStatusResponse(
+    llama_running = await _cached_health()
+    return ServerStatusResponse.model_construct(
         llama_running=llama_running,
         mcp_running=False,  # MCP optional, nicht implementiert
         current_model="mistral-7b" if llama_running else None
@@ -0,0 +1,368 @@
+"""
+chat_history.py
+
+Append-only Chat-Verlauf im JSONL-Format (eine Nachricht pro Zeile)
+- Neue Nachrichten werden angehängt statt die gesamte Datei neu zu schreiben
+- Filtern/Umschreiben läuft über eine Temp-Datei + fsync + os.replace (atomar, kein halber Verlauf nach Absturz)
+- Einmalige Migration der alten chat_history.json (JSON-Array)
+- In-Memory-Cache: die Datei wird nur einmal gelesen
+- Abgeschnittene letzte Zeile (Absturz/volle Platte beim Anhängen) wird beim ersten Laden entfernt,
+  unlesbare Zeilen werden übersprungen
+- Anhängen mit Debounce: Bursts werden gesammelt und höchstens alle flush_interval
+  Sekunden in einem Schreibvorgang (+ fsync) auf die Platte gebracht
+- Rotation: über max_active Nachrichten wandert der ältere Teil in
+  <name>.archive.<timestamp>.jsonl, die aktive Datei bleibt begrenzt
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+import aiofiles
+import orjson
+
+# Beim Neuschreiben Zeilen sammeln und blockweise schreiben (ein Thread-Hop pro Block statt pro Nachricht)
+WRITE_CHUNK_SIZE = 256 * 1024
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Macht ein os.replace im Verzeichnis dauerhaft (POSIX; unter Windows nicht möglich)"""
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _repair_tail(path: Path) -> None:
+    """
+    Stellt sicher, dass die Datei mit einer vollständigen Zeile endet
+
+    Ist die letzte Zeile gültiges JSON, fehlt nur der Zeilenumbruch (wird ergänzt); sonst wird
+    sie abgeschnitten, damit spätere Anhänge nicht mit ihr verschmelzen.
+    """
+    try:
+        f = open(path, "r+b")
+    except FileNotFoundError:
+        return
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+
+        # Beginn der letzten Zeile blockweise von hinten suchen
+        start = 0
+        pos = size
+        while pos > 0:
+            step = min(WRITE_CHUNK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            idx = f.read(step).rfind(b"\n")
+            if idx != -1:
+                start = pos + idx + 1
+                break
+
+        f.seek(start)
+        try:
+            orjson.loads(f.read())
+        except orjson.JSONDecodeError:
+            f.truncate(start)
+            print(f"⚠️ Dropped truncated last line ({size - start} bytes) from {path.name}")
+        else:
+            f.write(b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+async def _iter_jsonl(path: Path) -> AsyncIterator[Dict]:
+    """Liest eine JSONL-Datei zeilenweise, unlesbare Zeilen werden geloggt und übersprungen"""
+    if not path.exists():
+        return
+    async with aiofiles.open(path, "rb") as f:
+        lineno = 0
+        async for line in f:
+            lineno += 1
+            if not line.strip():
+                continue
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                print(f"⚠️ Skipping unreadable line {lineno} in {path.name}: {e}")
+
+
+class ChatHistoryStore:
+    """Chat-Verlauf als JSONL-Datei mit asynchronem Zugriff"""
+
+    def __init__(
+        self,
+        path: Path,
+        legacy_path: Optional[Path] = None,
+        flush_interval: float = 1.0,
+        max_active: Optional[int] = None,
+    ):
+        """
+        Args:
+            path: Pfad zur chat_history.jsonl
+            legacy_path: Pfad zur alten chat_history.json (wird einmalig migriert)
+            flush_interval: Mindestabstand zwischen zwei Schreibvorgängen beim Anhängen (Sekunden)
+            max_active: Maximale Anzahl Nachrichten in der aktiven Datei (None = unbegrenzt);
+                beim Überschreiten bleibt die neuere Hälfte aktiv, der Rest wird archiviert
+        """
+        self.path = Path(path)
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self.flush_interval = flush_interval
+        self.max_active = max_active
+        self._lock = asyncio.Lock()
+        self._migrated = False
+        # Prozess ist einziger Schreiber -> Verlauf nach dem ersten Lesen im Speicher halten
+        self._cache: Optional[List[Dict]] = None
+        # Angehängte, noch nicht geschriebene Zeilen
+        self._pending = bytearray()
+        self._last_flush = 0.0
+        # Wird bei jeder Änderung erhöht -> Schlüssel für abgeleitete Caches (z.B. /chat/sessions)
+        self.version = 0
+
+    async def _migrate_legacy(self) -> None:
+        """Konvertiert die alte JSON-Array-Datei einmalig nach JSONL"""
+        if self._migrated:
+            return
+        self._migrated = True
+
+        if not self.legacy_path or not self.legacy_path.exists() or self.path.exists():
+            return
+
+        try:
+            async with aiofiles.open(self.legacy_path, "rb") as f:
+                messages = orjson.loads(await f.read())
+        except Exception as e:
+            print(f"⚠️ Could not read legacy chat history: {e}")
+            messages = []
+
+        await self._write_all(messages if isinstance(messages, list) else [])
+        os.replace(self.legacy_path, self.legacy_path.with_suffix(".json.bak"))
+        print(f"✅ Migrated chat history to {self.path.name}")
+
+    @staticmethod
+    async def _dump_lines(f, messages) -> None:
+        """Schreibt Nachrichten als JSONL in eine geöffnete aiofiles-Datei (blockweise)"""
+        buf = bytearray()
+        for msg in messages:
+            buf += orjson.dumps(msg)
+            buf += b"\n"
+            if len(buf) >= WRITE_CHUNK_SIZE:
+                await f.write(bytes(buf))
+                buf.clear()
+        if buf:
+            await f.write(bytes(buf))
+
+    async def _replace_file(self, path: Path, messages) -> None:
+        """Schreibt Nachrichten in eine Temp-Datei und ersetzt path atomar"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".jsonl.tmp")
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                await self._dump_lines(f, messages)
+                await f.flush()
+                await asyncio.to_thread(os.fsync, f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        await asyncio.to_thread(_fsync_dir, path.parent)
+
+    async def _write_all(self, messages) -> None:
+        """Schreibt alle Nachrichten in eine Temp-Datei und ersetzt die aktive Datei atomar"""
+        await self._replace_file(self.path, messages)
+        # Datei entspricht jetzt dem Cache inkl. ausstehender Nachrichten
+        self._pending.clear()
+
+    async def _ensure_loaded(self) -> List[Dict]:
+        """Lädt den Verlauf beim ersten Zugriff in den Cache (Lock muss gehalten werden)"""
+        await self._migrate_legacy()
+        if self._cache is None:
+            await asyncio.to_thread(_repair_tail, self.path)
+            self._cache = [msg async for msg in _iter_jsonl(self.path)]
+        return self._cache
+
+    async def iter_messages(self) -> AsyncIterator[Dict]:
+        """Gibt alle Nachrichten nacheinander zurück"""
+        for msg in await self.load():
+            yield msg
+
+    async def load(self) -> List[Dict]:
+        """Gibt den gesamten Verlauf als (flache) Kopie der gecachten Liste zurück"""
+        try:
+            async with self._lock:
+                return list(await self._ensure_loaded())
+        except Exception as e:
+            print(f"⚠️ Could not load chat history: {e}")
+            return []
+
+    async def append(self, *messages: Dict) -> None:
+        """Hängt Nachrichten an (O(1) unabhängig von der Verlaufslänge, Schreiben mit Debounce)"""
+        data = b"".join(orjson.dumps(msg) + b"\n" for msg in messages)
+        async with self._lock:
+            cache = await self._ensure_loaded()
+            cache.extend(messages)
+            self.version += 1
+            self._pending += data
+            if self.max_active and len(cache) > self.max_active:
+                await self._rotate(cache)
+            elif time.monotonic() - self._last_flush >= self.flush_interval:
+                await self._flush_pending()
+
+    def archive_paths(self) -> List[Path]:
+        """Archivdateien, älteste zuerst"""
+        return sorted(self.path.parent.glob(f"{self.path.stem}.archive.*.jsonl"))
+
+    async def _rotate(self, cache: List[Dict]) -> None:
+        """
+        Verschiebt den älteren Teil des Verlaufs in eine Archivdatei (Lock muss gehalten werden)
+
+        Es bleibt die neuere Hälfte von max_active aktiv, damit nicht jede weitere
+        Nachricht eine erneute Rotation auslöst.
+        """
+        keep = max(self.max_active // 2, 1)
+        archived, active = cache[:-keep], cache[-keep:]
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        archive_path = self.path.with_name(f"{self.path.stem}.archive.{stamp}.jsonl")
+
+        # Erst archivieren, dann die aktive Datei kürzen: ein Abbruch dazwischen dupliziert höchstens
+        async with aiofiles.open(archive_path, "ab") as f:
+            await self._dump_lines(f, archived)
+            await f.flush()
+            await asyncio.to_thread(os.fsync, f.fileno())
+        await self._write_all(active)
+        self._cache = active
+        self._last_flush = time.monotonic()
+        print(f"📦 Archived {len(archived)} chat messages to {archive_path.name}")
+
+    async def iter_archived(self) -> AsyncIterator[Dict]:
+        """Liest archivierte Nachrichten (älteste zuerst) direkt von der Platte"""
+        for archive_path in self.archive_paths():
+            async for msg in _iter_jsonl(archive_path):
+                yield msg
+
+    async def _flush_pending(self) -> None:
+        """Schreibt gesammelte Zeilen in einem Rutsch (Lock muss gehalten werden)"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        data = bytes(self._pending)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(self.path, "ab") as f:
+            start = await f.tell()
+            try:
+                await f.write(data)
+                await f.flush()
+                await asyncio.to_thread(os.fsync, f.fileno())
+            except BaseException:
+                # Teilweise geschriebene Zeilen zurücknehmen; _pending bleibt für den nächsten Versuch
+                try:
+                    await f.truncate(start)
+                except OSError:
+                    pass
+                raise
+        # Erst nach erfolgreichem fsync verwerfen (Lock gehalten -> _pending ist unverändert)
+        del self._pending[:len(data)]
+
+    async def flush(self) -> None:
+        """Schreibt noch ausstehende Nachrichten sofort (z.B. beim Shutdown)"""
+        async with self._lock:
+            await self._flush_pending()
+
+    async def run_flusher(self) -> None:
+        """Hintergrund-Task: schreibt ausstehende Nachrichten spätestens nach flush_interval"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._pending:
+                try:
+                    await self.flush()
+                except Exception as e:
+                    print(f"⚠️ Could not flush chat history: {e}")
+
+    async def clear(self) -> None:
+        """Leert den Verlauf (inkl. Archive)"""
+        async with self._lock:
+            await self._migrate_legacy()
+            if self.path.exists():
+                os.truncate(self.path, 0)
+            for archive_path in self.archive_paths():
+                archive_path.unlink(missing_ok=True)
+            self._cache = []
+            self._pending.clear()
+            self.version += 1
+
+    async def count(self) -> int:
+        """Anzahl gespeicherter Nachrichten"""
+        async with self._lock:
+            return len(await self._ensure_loaded())
+
+    async def remove_where(self, predicate: Callable[[Dict], bool]) -> int:
+        """
+        Entfernt alle Nachrichten, für die predicate True liefert (inkl. Archive)
+
+        Returns:
+            Anzahl entfernter Nachrichten
+        """
+        async with self._lock:
+            cache = await self._ensure_loaded()
+            # Ein Durchlauf: behaltene Nachrichten sammeln (nur Referenzen) und Treffer zählen
+            kept, removed = [], 0
+            for msg in cache:
+                if predicate(msg):
+                    removed += 1
+                else:
+                    kept.append(msg)
+            if removed:
+                await self._write_all(kept)
+                self._cache = kept
+            archived_removed = await self._remove_from_archives(predicate)
+            if removed or archived_removed:
+                self.version += 1
+            return removed + archived_removed
+
+    async def _remove_from_archives(self, predicate: Callable[[Dict], bool]) -> int:
+        """Filtert die Archivdateien wie remove_where (Lock muss gehalten werden)"""
+        removed = 0
+        for archive_path in self.archive_paths():
+            kept, hits = [], 0
+            async for msg in _iter_jsonl(archive_path):
+                if predicate(msg):
+                    hits += 1
+                else:
+                    kept.append(msg)
+            if not hits:
+                continue
+            removed += hits
+            if kept:
+                await self._replace_file(archive_path, kept)
+            else:
+                archive_path.unlink(missing_ok=True)
+        return removed
+
+    async def update_where(self, update: Callable[[Dict], bool]) -> int:
+        """
+        Wendet update() auf jede Nachricht an und schreibt nur bei Änderungen neu
+
+        Args:
+            update: Verändert die Nachricht in-place, gibt True bei Änderung zurück
+
+        Returns:
+            Anzahl geänderter Nachrichten
+        """
+        async with self._lock:
+            cache = await self._ensure_loaded()
+            changed = sum(1 for msg in cache if update(msg))
+            if changed:
+                await self._write_all(cache)
+                self.version += 1
+            return changed
@@ -0,0 +1,46 @@
+"""
+json_cache.py
+
+Gecachtes Laden von JSON-Konfigurationsdateien
+- Schlüssel: (st_mtime_ns, st_size) der Datei -> Änderungen werden ohne Neustart erkannt
+- Im Normalfall nur ein stat() pro Aufruf statt open + parse
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, Tuple, Union
+
+import orjson
+
+_cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+_lock = threading.Lock()
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """
+    Lädt eine JSON-Datei, solange sie unverändert ist aus dem Cache
+
+    Das Ergebnis wird geteilt und darf vom Aufrufer nicht verändert werden.
+
+    Raises:
+        FileNotFoundError: Datei existiert nicht
+        orjson.JSONDecodeError: Ungültiges JSON
+    """
+    path = Path(path)
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    value = orjson.loads(path.read_bytes())
+    with _lock:
+        _cache[path] = (key, value)
+    return value
+
+
+def clear_json_cache() -> None:
+    """Leert den Cache (für Tests)"""
+    with _lock:
+        _cache.clear()
@@ -4,12 +4,17 @@ llm_client.py
 HTTP Client für Ollama (lokal oder remote)
 - Nutzt /api/generate (Prompt) und /api/chat (Messages)
 - keep_alive zur Schonung von VRAM (6GB RTX 3060)
+- Asynchron über den gemeinsamen "ollama"-Pool aus adapters.http (Keep-Alive)
+- stream(): /api/chat als NDJSON-Stream, chat() setzt die Chunks zusammen
 """
 
 import os
-from typing import Optional, Dict, Any, List
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-import requests
+import httpx
+import orjson
+
+from backend.adapters.http import OLLAMA_POOL_SIZE, get_http_client
 
 
 class LLMClient:
@@ -29,19 +34,39 @@ class LLMClient:
         self.timeout = int(os.getenv("LLM_CLIENT_TIMEOUT", "180"))
         self.keep_alive = os.getenv("LLM_KEEP_ALIVE", "5m")
 
-    def _build_options(self, **kwargs) -> Dict[str, Any]:
-        """Merge default and override generation options"""
-        options = {
-            "temperature": kwargs.get("temperature", self.temperature),
-            "top_p": kwargs.get("top_p", self.top_p),
-            "top_k": kwargs.get("top_k", self.top_k),
-            "num_predict": kwargs.get("max_tokens", self.max_tokens),
+        # Defaults einmalig, _build_options gibt sie ohne Overrides unverändert zurück (nicht verändern)
+        self._default_options: Dict[str, Any] = {
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "top_k": self.top_k,
+            "num_predict": self.max_tokens,
         }
 
-        # Remove None to avoid overriding Ollama defaults unintentionally
-        return {k: v for k, v in options.items() if v is not None}
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled HTTP client (same pool as OllamaProvider)"""
+        return get_http_client("ollama", max_connections=OLLAMA_POOL_SIZE)
+
+    # kwargs-Name -> Ollama-Option
+    _OPTION_KEYS = {
+        "temperature": "temperature",
+        "top_p": "top_p",
+        "top_k": "top_k",
+        "max_tokens": "num_predict",
+    }
+
+    def _build_options(self, **kwargs) -> Dict[str, Any]:
+        """Merge default and override generation options (shared defaults dict when nothing is overridden)"""
+        overrides = {
+            option: kwargs[key]
+            for key, option in self._OPTION_KEYS.items()
+            if kwargs.get(key) is not None
+        }
+        if not overrides:
+            return self._default_options
+        return {**self._default_options, **overrides}
 
-    def complete(self, prompt: str, model: Optional[str] = None, **kwargs) -> str:
+    async def complete(self, prompt: str, model: Optional[str] = None, **kwargs) -> str:
         """Prompt-based completion via Ollama /api/generate"""
         model_name = model or self.default_model
         payload = {
@@ -53,50 +78,64 @@ class LLMClient:
         }
 
         try:
-            response = requests.post(
+            response = await self.client.post(
                 f"{self.base_url}/api/generate",
-                json=payload,
+                content=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"},
                 timeout=self.timeout,
             )
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             # Ollama returns text in "response"
             return result.get("response", "").strip()
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise RuntimeError(f"LLM Request failed: {e}")
         except Exception as e:
             raise RuntimeError(f"Unexpected error: {e}")
 
-    def chat(self, messages: List[Dict[str, Any]], model: Optional[str] = None, **kwargs) -> str:
-        """Chat-style completion via Ollama /api/chat"""
+    async def stream(self, messages: List[Dict[str, Any]], model: Optional[str] = None, **kwargs) -> AsyncIterator[str]:
+        """Streaming chat via Ollama /api/chat (NDJSON, yields content chunks as they arrive)"""
         model_name = model or self.default_model
         payload = {
             "model": model_name,
             "messages": messages,
-            "stream": False,
+            "stream": True,
             "keep_alive": kwargs.get("keep_alive", self.keep_alive),
             "options": self._build_options(**kwargs),
         }
 
         try:
-            response = requests.post(
+            async with self.client.stream(
+                "POST",
                 f"{self.base_url}/api/chat",
-                json=payload,
+                content=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"},
                 timeout=self.timeout,
-            )
-            response.raise_for_status()
-            result = response.json()
-            message = result.get("message", {})
-            return message.get("content", "").strip()
-        except requests.exceptions.RequestException as e:
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = orjson.loads(line)
+                    content = chunk.get("message", {}).get("content")
+                    if content:
+                        yield content
+                    if chunk.get("done"):
+                        break
+        except httpx.HTTPError as e:
             raise RuntimeError(f"LLM Request failed: {e}")
-        except Exception as e:
+        except orjson.JSONDecodeError as e:
             raise RuntimeError(f"Unexpected error: {e}")
 
-    def is_healthy(self) -> bool:
+    async def chat(self, messages: List[Dict[str, Any]], model: Optional[str] = None, **kwargs) -> str:
+        """Chat-style completion via Ollama /api/chat (joins the stream)"""
+        chunks = [chunk async for chunk in self.stream(messages, model, **kwargs)]
+        return "".join(chunks).strip()
+
+    async def is_healthy(self) -> bool:
         """Check if Ollama server is reachable"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
+            response = await self.client.get(f"{self.base_url}/api/tags", timeout=2)
             return response.status_code == 200
         except Exception:
             return False
@@ -7,10 +7,16 @@ Verwaltet Modelle und LoRA-Adapter aus models_kiff.json
 - Prüft ob Dateien existieren
 """
 
-import json
 import os
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from backend.core.json_cache import load_json
+
+# Ergebnis der Datei-Prüfung pro Modell so lange wiederverwenden (GGUF/LoRA-Dateien ändern sich selten)
+MODEL_PATH_CACHE_TTL = 30.0
 
 
 class ModelRegistry:
@@ -22,10 +28,25 @@ class ModelRegistry:
             config_path: Pfad zur models_kiff.json
         """
         self.config_path = config_path
+        self.reload()
+
+    def reload(self):
+        """Lädt die Konfiguration neu und berechnet Index, Default und Modell-Liste"""
         self.config = self._load_config()
+        self._model_index = self._build_model_index()
+
+        models = self.config.get("models", {})
+        self._default_model: Optional[str] = next(
+            (name for name, config in models.items() if config.get("is_default")),
+            # Fallback auf erstes Modell
+            next(iter(models), None),
+        )
+        self._available_models: List[str] = list(models) + list(self.config.get("adapters", {}))
+        # model_name -> (monotonic Zeitpunkt der Prüfung, Ergebnis)
+        self._path_cache: Dict[str, Tuple[float, bool]] = {}
 
     def _load_config(self) -> Dict:
-        """Lädt models_kiff.json"""
+        """Lädt models_kiff.json (geparst gecacht über json_cache, nicht verändern)"""
         if not os.path.exists(self.config_path):
             # Fallback config
             return {
@@ -41,54 +62,64 @@ class ModelRegistry:
                 "adapters": {}
             }
 
-        with open(self.config_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_json(self.config_path)
 
-    def get_default_model(self) -> str:
-        """Gibt Name des Standard-Modells zurück"""
-        for model_name, config in self.config.get("models", {}).items():
-            if config.get("is_default"):
-                return model_name
-        # Fallback auf erstes Modell
-        return next(iter(self.config.get("models", {})))
+    def get_default_model(self) -> Optional[str]:
+        """Gibt Name des Standard-Modells zurück (None wenn keine Modelle konfiguriert)"""
+        return self._default_model
 
     def get_available_models(self) -> List[str]:
-        """Gibt Liste aller verfügbaren Modelle (Base + Adapter)"""
-        models = list(self.config.get("models", {}).keys())
-        adapters = list(self.config.get("adapters", {}).keys())
-        return models + adapters
+        """Gibt Liste aller verfügbaren Modelle (Base + Adapter) zurück (geteilte Liste, nicht verändern)"""
+        return self._available_models
 
-    def get_model_config(self, model_name: str) -> Optional[Dict]:
+    def _build_model_index(self) -> Dict[str, Mapping[str, Any]]:
         """
-        Gibt Konfiguration für ein Modell oder Adapter zurück
+        Löst Basis-Modelle und Adapter einmalig zu fertigen Konfigurationen auf
 
-        Returns:
-            Dict mit: model_path, gpu_layers, context_size, description, lora_path (falls Adapter)
+        Die Einträge sind schreibgeschützt (MappingProxyType), damit get_model_config
+        sie ohne defensive Kopie herausgeben kann.
         """
-        # Prüfe Basis-Modelle
-        if model_name in self.config.get("models", {}):
-            model_config = self.config["models"][model_name].copy()
-            model_config["type"] = "base_model"
-            return model_config
-
-        # Prüfe Adapter
-        if model_name in self.config.get("adapters", {}):
-            adapter_config = self.config["adapters"][model_name].copy()
-            base_model = adapter_config.get("base_model")
+        models = self.config.get("models", {})
+        index: Dict[str, Mapping[str, Any]] = {}
+
+        for model_name, model_config in models.items():
+            index[model_name] = MappingProxyType({**model_config, "type": "base_model"})
 
+        for adapter_name, adapter_config in self.config.get("adapters", {}).items():
+            base_model = adapter_config.get("base_model")
             # Hole Config vom Base-Modell
-            if base_model and base_model in self.config.get("models", {}):
-                base_config = self.config["models"][base_model].copy()
-                base_config["type"] = "adapter"
-                base_config["lora_path"] = adapter_config.get("lora_path")
-                base_config["adapter_name"] = model_name
-                base_config["description"] = adapter_config.get("description")
-                return base_config
+            if base_model and base_model in models:
+                index[adapter_name] = MappingProxyType({
+                    **models[base_model],
+                    "type": "adapter",
+                    "lora_path": adapter_config.get("lora_path"),
+                    "adapter_name": adapter_name,
+                    "description": adapter_config.get("description"),
+                })
+
+        return index
+
+    def get_model_config(self, model_name: str) -> Optional[Mapping[str, Any]]:
+        """
+        Gibt Konfiguration für ein Modell oder Adapter zurück (schreibgeschützt)
 
-        return None
+        Returns:
+            Mapping mit: model_path, gpu_layers, context_size, description, lora_path (falls Adapter)
+        """
+        return self._model_index.get(model_name)
 
     def validate_model_paths(self, model_name: str) -> bool:
-        """Prüft ob alle erforderlichen Dateien für ein Modell existieren"""
+        """Prüft ob alle erforderlichen Dateien für ein Modell existieren (gecacht für MODEL_PATH_CACHE_TTL)"""
+        now = time.monotonic()
+        cached = self._path_cache.get(model_name)
+        if cached is not None and now - cached[0] < MODEL_PATH_CACHE_TTL:
+            return cached[1]
+
+        valid = self._check_model_paths(model_name)
+        self._path_cache[model_name] = (now, valid)
+        return valid
+
+    def _check_model_paths(self, model_name: str) -> bool:
         config = self.get_model_config(model_name)
         if not config:
             return False
@@ -0,0 +1,55 @@
+"""
+persisted_selection.py
+
+Einzelner persistierter Auswahlwert (z.B. aktuelles Profil oder Modell) in einer kleinen JSON-Datei
+- get() parst die Datei nur nach einer Änderung (st_mtime_ns, st_size), sonst ein stat()
+- set() schreibt durch und aktualisiert den Cache direkt
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+import orjson
+
+
+class PersistedSelection:
+    """Cached Zugriff auf {"<key>": "<wert>"}-Dateien wie current_profile.json"""
+
+    def __init__(self, path: Path, key: str, default: Optional[str] = None):
+        """
+        Args:
+            path: Pfad zur JSON-Datei
+            key: Schlüssel des Werts in der Datei (z.B. "profile")
+            default: Rückgabewert, wenn die Datei fehlt oder keinen gültigen Wert enthält
+        """
+        self.path = Path(path)
+        self.key = key
+        self.default = default
+        self._stat_key: Optional[Tuple[int, int]] = None
+        self._value: Optional[str] = default
+
+    def get(self) -> Optional[str]:
+        """Aktueller Wert (Datei wird nur bei Änderung neu gelesen)"""
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            self._stat_key = None
+            return self.default
+
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if stat_key != self._stat_key:
+            try:
+                value = orjson.loads(self.path.read_bytes()).get(self.key)
+            except Exception:
+                value = None
+            self._value = value if isinstance(value, str) and value else self.default
+            self._stat_key = stat_key
+        return self._value
+
+    def set(self, value: str) -> None:
+        """Wert persistieren und Cache aktualisieren"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_bytes(orjson.dumps({self.key: value}, option=orjson.OPT_INDENT_2))
+        st = self.path.stat()
+        self._value = value
+        self._stat_key = (st.st_mtime_ns, st.st_size)
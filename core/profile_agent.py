@@ -8,9 +8,9 @@ Multi-Profil Agent mit Provider-Support
 - Unterstützt Web-Context Fetching via @tags
 """
 
-import json
 import os
-from typing import Dict, Optional, List
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from backend.core.json_cache import load_json
 from backend.core.llm_client import LLMClient
 from backend.core.provider_manager import get_provider_manager, ProviderManager
 from backend.adapters.base_provider import ChatMessage, ChatResponse
@@ -36,6 +36,11 @@ class ProfileAgent:
         self.provider_manager = provider_manager or get_provider_manager()
         self.profiles_config_path = profiles_config_path
         self.profiles = self._load_profiles()
+        # System-Nachricht pro Profil einmalig, wird über alle Turns wiederverwendet (nicht verändern)
+        self._system_messages: Dict[str, ChatMessage] = {
+            name: ChatMessage(role="system", content=profile.get("system_prompt", ""))
+            for name, profile in self.profiles.items()
+        }
         self.current_profile = "general_chat"
         self.context_manager = ContextManager()
         self.last_model_used: Optional[str] = None
@@ -64,23 +69,24 @@ class ProfileAgent:
                 }
             }
 
-        with open(self.profiles_config_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            # Support both {"profiles": {...}} and direct {...} format
-            profiles = data["profiles"] if "profiles" in data else data
-            
-            # Load external prompt files if they exist
-            config_dir = os.path.dirname(self.profiles_config_path)
-            prompts_dir = os.path.join(config_dir, "prompts")
-            
-            for profile_name, profile_config in profiles.items():
-                # Check for external .md prompt file
-                prompt_file = os.path.join(prompts_dir, f"{profile_name}.md")
-                if os.path.exists(prompt_file):
-                    with open(prompt_file, "r", encoding="utf-8") as pf:
-                        profile_config["system_prompt"] = pf.read()
-            
-            return profiles
+        # Geparstes JSON ist gecacht und geteilt -> Profile kopieren, bevor Prompts eingesetzt werden
+        data = load_json(self.profiles_config_path)
+        # Support both {"profiles": {...}} and direct {...} format
+        raw_profiles = data["profiles"] if "profiles" in data else data
+        profiles = {name: dict(config) for name, config in raw_profiles.items()}
+        
+        # Load external prompt files if they exist
+        config_dir = os.path.dirname(self.profiles_config_path)
+        prompts_dir = os.path.join(config_dir, "prompts")
+        
+        for profile_name, profile_config in profiles.items():
+            # Check for external .md prompt file
+            prompt_file = os.path.join(prompts_dir, f"{profile_name}.md")
+            if os.path.exists(prompt_file):
+                with open(prompt_file, "r", encoding="utf-8") as pf:
+                    profile_config["system_prompt"] = pf.read()
+        
+        return profiles
 
     def set_profile(self, profile_name: str) -> bool:
         """Wechselt aktives Profil"""
@@ -144,18 +150,12 @@ class ProfileAgent:
         
         return provider_config.get("default_model")
 
-    async def run(self, query: str, profile_name: Optional[str] = None, provider_name: Optional[str] = None, **kwargs) -> str:
+    def _prepare_run(self, query: str, profile_name: Optional[str], provider_name: Optional[str], kwargs: Dict) -> Tuple[str, str, str, List[ChatMessage], Optional[float], Optional[int]]:
         """
-        Führt Query mit aktuellem oder spezifischem Profil und Provider aus
-
-        Args:
-            query: User query
-            profile_name: Optional override für Profil
-            provider_name: Optional override für Provider
-            **kwargs: Weitere Parameter für LLM (model, temperature, max_tokens, etc.)
+        Löst Profil, Provider, Modell und Parameter für run()/run_stream() auf
 
         Returns:
-            LLM response
+            (active_profile, active_provider, model_name, messages, temperature, max_tokens)
         """
         # Verwende aktuelles Profil oder override
         active_profile = profile_name if profile_name else self.current_profile
@@ -164,7 +164,6 @@ class ProfileAgent:
             active_profile = "general_chat"
 
         profile = self.profiles[active_profile]
-        system_prompt = profile.get("system_prompt", "")
         
         # Determine provider
         active_provider = provider_name or self.provider_manager.get_current_provider_name()
@@ -193,9 +192,67 @@ class ProfileAgent:
 
         # Baue Messages mit ChatMessage-Objekten
         messages = [
-            ChatMessage(role="system", content=system_prompt),
+            self._system_messages[active_profile],
             ChatMessage(role="user", content=query)
         ]
+        return active_profile, active_provider, model_name, messages, temperature, max_tokens
+
+    async def run_stream(self, query: str, profile_name: Optional[str] = None, provider_name: Optional[str] = None, **kwargs) -> AsyncIterator[str]:
+        """
+        Wie run(), liefert die Antwort aber in Chunks, sobald der Provider sie sendet
+
+        Fallback auf den lokalen Provider nur, solange noch kein Chunk gesendet wurde.
+        """
+        active_profile, active_provider, model_name, messages, temperature, max_tokens = self._prepare_run(
+            query, profile_name, provider_name, kwargs
+        )
+        started = False
+        try:
+            async for chunk in self.provider_manager.chat_stream(
+                messages=messages,
+                model=model_name,
+                provider_name=active_provider,
+                temperature=temperature,
+                max_tokens=max_tokens
+            ):
+                started = True
+                yield chunk
+        except Exception as e:
+            if started or active_provider == "lokal":
+                raise
+            print(f"⚠️  Provider '{active_provider}' failed: {e}")
+            print(f"🔄 Fallback zu lokalem Provider...")
+            fallback_model = self.get_default_model_for_profile(active_profile, "lokal") or "mistral-7b"
+            self.last_provider_used = "lokal"
+            self.last_model_used = fallback_model
+            async for chunk in self.provider_manager.chat_stream(
+                messages=messages,
+                model=fallback_model,
+                provider_name="lokal",
+                temperature=temperature,
+                max_tokens=max_tokens
+            ):
+                yield chunk
+
+    async def run(self, query: str, profile_name: Optional[str] = None, provider_name: Optional[str] = None, **kwargs) -> str:
+        """
+        Führt Query mit aktuellem oder spezifischem Profil und Provider aus
+
+        Args:
+            query: User query
+            profile_name: Optional override für Profil
+            provider_name: Optional override für Provider
+            **kwargs: Weitere Parameter für LLM (model, temperature, max_tokens, etc.)
+
+        Returns:
+            LLM response
+
+        Raises:
+            Exception: Wenn Provider (und ggf. lokaler Fallback) fehlschlagen
+        """
+        active_profile, active_provider, model_name, messages, temperature, max_tokens = self._prepare_run(
+            query, profile_name, provider_name, kwargs
+        )
 
         # Rufe Provider auf
         try:
@@ -234,9 +291,12 @@ class ProfileAgent:
                     )
                     return f"⚠️ Fallback zu lokalem Modell\n\n{response.content}"
                 except Exception as fallback_error:
-                    return f"Error: Provider '{active_provider}' failed: {e}\nFallback failed: {fallback_error}"
-            else:
-                return f"Error: {str(e)}"
+                    print(f"❌ Fallback failed: {fallback_error}")
+                    raise RuntimeError(
+                        f"Provider '{active_provider}' failed: {e}\nFallback failed: {fallback_error}"
+                    ) from fallback_error
+            print(f"❌ Provider '{active_provider}' failed: {e}")
+            raise
 
     def get_current_profile(self) -> str:
         """Gibt Namen des aktuellen Profils zurück"""
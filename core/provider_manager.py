@@ -10,7 +10,8 @@ Provider Manager - Zentrale Verwaltung aller LLM Provider
 
 import json
 import os
-from typing import Dict, Optional, List
+import threading
+from typing import Any, AsyncIterator, Dict, Optional, List, Union
 from pathlib import Path
 
 from backend.adapters.base_provider import (
@@ -21,6 +22,7 @@ from backend.adapters.base_provider import (
     ChatResponse,
     ProviderValidationResult
 )
+from backend.adapters.catalog import load_providers_catalog
 from backend.adapters.ollama_provider import OllamaProvider
 from backend.adapters.groq_provider import GroqProvider
 
@@ -47,8 +49,6 @@ class ProviderManager:
         
         # Load configs
         self.backend_dir = Path(__file__).parent.parent
-        self.providers_config_path = self.backend_dir / "config" / "providers_kiff.json"
-        self.models_config_path = self.backend_dir / "config" / "models_kiff.json"
         self.current_provider_path = self.backend_dir / "documents" / "current_provider.json"
         
         # Initialize providers
@@ -60,16 +60,8 @@ class ProviderManager:
     def _load_and_register_providers(self):
         """Load provider configs and register provider instances"""
         
-        # Load providers config
-        with open(self.providers_config_path, "r", encoding="utf-8") as f:
-            providers_data = json.load(f)
-        
-        # Load models config
-        with open(self.models_config_path, "r", encoding="utf-8") as f:
-            models_data = json.load(f)
-        
-        # Register each enabled provider
-        providers_config = providers_data.get("providers", {})
+        # Register each enabled provider (catalog is parsed once per process)
+        providers_config = load_providers_catalog().get("providers", {})
         
         for provider_name, provider_data in providers_config.items():
             if not provider_data.get("enabled", False):
@@ -82,9 +74,9 @@ class ProviderManager:
             provider_type = config.type
             
             if provider_type == "ollama":
-                provider = OllamaProvider(config, models_data.get("providers", {}))
+                provider = OllamaProvider(config)
             elif provider_type == "groq":
-                provider = GroqProvider(config, models_data.get("providers", {}))
+                provider = GroqProvider(config)
             else:
                 print(f"⚠️  Unknown provider type: {provider_type}, skipping {provider_name}")
                 continue
@@ -267,6 +259,49 @@ class ProviderManager:
         provider = self.get_provider(provider_name)
         return await provider.chat(messages, model, **kwargs)
     
+    async def chat_stream(
+        self,
+        messages: List[ChatMessage],
+        model: str,
+        provider_name: Optional[str] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream chat response from provider
+        
+        Args:
+            messages: Chat messages
+            model: Model ID
+            provider_name: Provider name, uses current if None
+            **kwargs: Additional parameters (temperature, max_tokens, etc.)
+            
+        Yields:
+            Incremental text chunks
+        """
+        provider = self.get_provider(provider_name)
+        async for chunk in provider.chat_stream(messages, model, **kwargs):
+            yield chunk
+    
+    async def chat_many(
+        self,
+        requests: List[Dict[str, Any]],
+        provider_name: Optional[str] = None,
+        concurrency: Optional[int] = None
+    ) -> List[Union[ChatResponse, Exception]]:
+        """
+        Send multiple chat requests concurrently
+        
+        Args:
+            requests: List of chat() kwargs (messages, model, temperature, ...)
+            provider_name: Provider name, uses current if None
+            concurrency: Max parallel requests, derived from rate limits if None
+            
+        Returns:
+            Responses (or Exceptions) in request order
+        """
+        provider = self.get_provider(provider_name)
+        return await provider.chat_many(requests, concurrency=concurrency)
+    
     async def is_healthy(self, provider_name: Optional[str] = None) -> bool:
         """
         Check if provider is healthy
@@ -286,11 +321,14 @@ class ProviderManager:
 
 # Global singleton instance
 _provider_manager: Optional[ProviderManager] = None
+_provider_manager_lock = threading.Lock()
 
 
 def get_provider_manager() -> ProviderManager:
-    """Get global ProviderManager singleton"""
+    """Get global ProviderManager singleton (thread-safe, double-checked)"""
     global _provider_manager
     if _provider_manager is None:
-        _provider_manager = ProviderManager()
+        with _provider_manager_lock:
+            if _provider_manager is None:
+                _provider_manager = ProviderManager()
     return _provider_manager
@@ -13,6 +13,7 @@ from .context_manager import ContextManager
 from .web_context_service import (
     fetch_text,
     clear_cache,
+    clear_cache_for_urls,
     get_cache_stats,
     RateLimiter,
     CACHE_DIR,
@@ -23,6 +24,7 @@ __all__ = [
     "ContextManager",
     "fetch_text",
     "clear_cache",
+    "clear_cache_for_urls",
     "get_cache_stats",
     "RateLimiter",
     "CACHE_DIR",
@@ -9,7 +9,7 @@ import json
 import logging
 import re
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from .web_context_service import fetch_text
 
@@ -28,12 +28,30 @@ class ContextManager:
     def __init__(self, config_file: Path = CONTEXT_SETS_FILE):
         self.config_file = config_file
         self.context_sets: Dict = {}
+        # (st_mtime_ns, st_size) der geladenen Datei, None = Datei fehlte
+        self._file_key: Optional[Tuple[int, int]] = None
+        # Aufgelöste URL-Listen pro Set, gültig bis zum nächsten Laden
+        self._resolved: Dict[str, List[str]] = {}
         self._load_context_sets()
 
+    def _stat_key(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = self.config_file.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _refresh_if_changed(self):
+        """Lädt die Konfiguration nur neu, wenn sich die Datei geändert hat (ein stat())"""
+        if self._stat_key() != self._file_key:
+            self._load_context_sets()
+
     def _load_context_sets(self):
         """Lädt Context-Sets aus JSON-Konfiguration"""
+        self._resolved = {}
+        self._file_key = self._stat_key()
         try:
-            if not self.config_file.exists():
+            if self._file_key is None:
                 logger.warning(f"Context sets file not found: {self.config_file}")
                 self.context_sets = {}
                 return
@@ -140,6 +158,7 @@ class ContextManager:
             Fehlerhafte URLs werden übersprungen.
         """
         # Parse @tags
+        self._refresh_if_changed()
         set_names = self.parse_prompt_for_sets(prompt)
 
         if not set_names:
@@ -151,8 +170,7 @@ class ContextManager:
         # Resolve URLs
         all_urls = []
         for set_name in set_names:
-            urls = self.resolve_set(set_name)
-            all_urls.extend(urls)
+            all_urls.extend(self._resolve_cached(set_name))
 
         # Deduplizieren
         unique_urls = list(set(all_urls))
@@ -173,10 +191,24 @@ class ContextManager:
         logger.info(f"Successfully fetched {len(contexts)} contexts")
         return contexts
 
+    def _resolve_cached(self, set_name: str) -> List[str]:
+        """resolve_set mit Cache pro Set (geteilte Liste, nicht verändern)"""
+        urls = self._resolved.get(set_name)
+        if urls is None:
+            urls = self._resolved[set_name] = self.resolve_set(set_name)
+        return urls
+
     def get_available_sets(self) -> List[str]:
         """Gibt Liste aller verfügbaren Context-Set Namen zurück"""
+        self._refresh_if_changed()
         return list(self.context_sets.keys())
 
     def get_set_urls(self, set_name: str) -> List[str]:
         """Gibt alle URLs für ein bestimmtes Set zurück (resolved)"""
-        return self.resolve_set(set_name)
+        self._refresh_if_changed()
+        return list(self._resolve_cached(set_name))
+
+    def get_all_set_urls(self) -> Dict[str, List[str]]:
+        """Alle Sets mit ihren aufgelösten URLs in einem Durchlauf"""
+        self._refresh_if_changed()
+        return {name: list(self._resolve_cached(name)) for name in self.context_sets}
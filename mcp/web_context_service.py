@@ -14,6 +14,7 @@ Features:
 import hashlib
 import html.parser
 import logging
+import os
 import time
 from collections import defaultdict
 from pathlib import Path
@@ -191,25 +192,61 @@ async def fetch_text(
         raise
 
 
+def _iter_cache_entries():
+    """Ein scandir-Durchlauf über alle Cache-Dateien (*.txt)"""
+    with os.scandir(CACHE_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".txt") and entry.is_file():
+                yield entry
+
+
+def _unlink_all(paths) -> int:
+    """Löscht Dateien ohne vorheriges exists() (ein Syscall pro Datei), zählt gelöschte"""
+    count = 0
+    for path in paths:
+        try:
+            os.unlink(path)
+            count += 1
+        except FileNotFoundError:
+            pass
+    return count
+
+
 async def clear_cache():
     """Löscht alle Cache-Dateien"""
-    count = 0
-    for file in CACHE_DIR.glob("*.txt"):
-        file.unlink()
-        count += 1
+    count = await asyncio.to_thread(
+        lambda: _unlink_all([entry.path for entry in _iter_cache_entries()])
+    )
     logger.info(f"Cleared {count} cache files")
     return count
 
 
-async def get_cache_stats() -> Dict:
+async def clear_cache_for_urls(urls: List[str]) -> int:
     """
-    Gibt Cache-Statistiken zurück
+    Löscht die Cache-Dateien für bestimmte URLs
 
     Returns:
-        Dict mit: file_count, total_size_bytes, oldest_file_age_hours, newest_file_age_hours
+        Anzahl gelöschter Dateien
     """
-    files = list(CACHE_DIR.glob("*.txt"))
-    if not files:
+    paths = {url_to_cache_file(url) for url in urls}
+    return await asyncio.to_thread(_unlink_all, paths)
+
+
+def _cache_stats() -> Dict:
+    now = time.time()
+    file_count = 0
+    total_size = 0
+    oldest_mtime = newest_mtime = None
+    for entry in _iter_cache_entries():
+        st = entry.stat()
+        file_count += 1
+        total_size += st.st_size
+        if oldest_mtime is None or st.st_mtime < oldest_mtime:
+            oldest_mtime = st.st_mtime
+        if newest_mtime is None or st.st_mtime > newest_mtime:
+            newest_mtime = st.st_mtime
+
+    if not file_count:
         return {
             "file_count": 0,
             "total_size_bytes": 0,
@@ -217,17 +254,23 @@ async def get_cache_stats() -> Dict:
             "newest_file_age_hours": None
         }
 
-    total_size = sum(f.stat().st_size for f in files)
-    now = time.time()
-    ages = [(now - f.stat().st_mtime) / 3600 for f in files]  # in Stunden
-
     return {
-        "file_count": len(files),
+        "file_count": file_count,
         "total_size_bytes": total_size,
-        "oldest_file_age_hours": max(ages),
-        "newest_file_age_hours": min(ages)
+        "oldest_file_age_hours": (now - oldest_mtime) / 3600,
+        "newest_file_age_hours": (now - newest_mtime) / 3600
     }
 
 
+async def get_cache_stats() -> Dict:
+    """
+    Gibt Cache-Statistiken zurück (ein scandir + ein stat pro Datei, im Worker-Thread)
+
+    Returns:
+        Dict mit: file_count, total_size_bytes, oldest_file_age_hours, newest_file_age_hours
+    """
+    return await asyncio.to_thread(_cache_stats)
+
+
 # Import asyncio hier am Ende um zirkuläre Imports zu vermeiden
 import asyncio
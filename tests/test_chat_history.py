@@ -0,0 +1,179 @@
+import asyncio
+import json
+import os
+
+from backend.core.chat_history import ChatHistoryStore
+
+
+def test_legacy_json_is_migrated_to_jsonl(tmp_path):
+    legacy = tmp_path / "chat_history.json"
+    legacy.write_text(json.dumps([{"role": "user", "content": "hallo"}]), encoding="utf-8")
+    store = ChatHistoryStore(tmp_path / "chat_history.jsonl", legacy_path=legacy)
+
+    messages = asyncio.run(store.load())
+
+    assert messages == [{"role": "user", "content": "hallo"}]
+    assert not legacy.exists()
+    assert (tmp_path / "chat_history.json.bak").exists()
+
+
+def test_append_remove_and_update(tmp_path):
+    store = ChatHistoryStore(tmp_path / "chat_history.jsonl")
+
+    async def run():
+        await store.append(
+            {"role": "user", "content": "a", "profile": "x", "provider": "groq"},
+            {"role": "assistant", "content": "b", "profile": "x", "provider": "groq"},
+        )
+        await store.append({"role": "user", "content": "c"})
+        assert await store.count() == 3
+
+        removed = await store.remove_where(lambda m: m.get("profile") == "x")
+        changed = await store.update_where(lambda m: m.setdefault("profile", "general_chat") == "general_chat")
+        return removed, changed, await store.load(), await store.count()
+
+    removed, changed, messages, count = asyncio.run(run())
+
+    assert removed == 2
+    assert changed == 1
+    assert messages == [{"role": "user", "content": "c", "profile": "general_chat"}]
+    assert count == 1
+    assert len((tmp_path / "chat_history.jsonl").read_bytes().splitlines()) == 1
+
+
+def test_history_is_read_from_disk_only_once(tmp_path):
+    path = tmp_path / "chat_history.jsonl"
+    path.write_bytes(b'{"role":"user","content":"a"}\n')
+    store = ChatHistoryStore(path)
+
+    async def run():
+        first = await store.load()
+        path.write_bytes(b"")  # external change is not picked up again
+        first.append({"role": "user", "content": "mutated copy"})
+        return await store.load()
+
+    assert asyncio.run(run()) == [{"role": "user", "content": "a"}]
+
+
+def test_appends_within_flush_interval_are_coalesced(tmp_path):
+    path = tmp_path / "chat_history.jsonl"
+    store = ChatHistoryStore(path, flush_interval=60.0)
+
+    async def run():
+        await store.append({"role": "user", "content": "a"})  # first write goes straight to disk
+        await store.append({"role": "assistant", "content": "b"})
+        await store.append({"role": "user", "content": "c"})
+        before = len(path.read_bytes().splitlines())
+        await store.flush()
+        return before, await store.count()
+
+    before, count = asyncio.run(run())
+
+    assert before == 1
+    assert count == 3
+    assert len(path.read_bytes().splitlines()) == 3
+
+
+def test_history_over_max_active_is_rotated_to_archive(tmp_path):
+    path = tmp_path / "chat_history.jsonl"
+    store = ChatHistoryStore(path, max_active=4)
+
+    async def run():
+        for i in range(5):
+            await store.append({"role": "user", "content": str(i)})
+        archived = [m["content"] async for m in store.iter_archived()]
+        active = [m["content"] for m in await store.load()]
+        return archived, active
+
+    archived, active = asyncio.run(run())
+
+    assert archived == ["0", "1", "2"]
+    assert active == ["3", "4"]
+    assert len(path.read_bytes().splitlines()) == 2
+    assert len(store.archive_paths()) == 1
+
+    asyncio.run(store.clear())
+    assert store.archive_paths() == []
+
+
+def test_torn_trailing_line_is_dropped_on_load(tmp_path):
+    path = tmp_path / "chat_history.jsonl"
+    path.write_bytes(b'{"role":"user","content":"hi"}\n{"role":"assis')
+    store = ChatHistoryStore(path)
+
+    async def run():
+        loaded = await store.load()
+        await store.append({"role": "assistant", "content": "ok"})
+        await store.flush()
+        return loaded, await store.count()
+
+    loaded, count = asyncio.run(run())
+
+    assert loaded == [{"role": "user", "content": "hi"}]
+    assert count == 2
+    reloaded = asyncio.run(ChatHistoryStore(path).load())
+    assert reloaded == [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "ok"}]
+
+
+def test_unreadable_lines_are_skipped(tmp_path):
+    path = tmp_path / "chat_history.jsonl"
+    path.write_bytes(b'{"role":"user","content":"a"}\nnot json\n{"role":"user","content":"b"}')
+    store = ChatHistoryStore(path)
+
+    assert [m["content"] for m in asyncio.run(store.load())] == ["a", "b"]
+    assert path.read_bytes().endswith(b'"b"}\n')
+
+
+def test_failed_flush_keeps_pending_messages(tmp_path, monkeypatch):
+    path = tmp_path / "chat_history.jsonl"
+    store = ChatHistoryStore(path, flush_interval=60.0)
+    real_fsync = os.fsync
+
+    def failing_fsync(fd):
+        raise OSError(28, "No space left on device")
+
+    async def run():
+        await store.append({"role": "user", "content": "a"})
+        await store.append({"role": "assistant", "content": "b"})
+        monkeypatch.setattr(os, "fsync", failing_fsync)
+        try:
+            await store.flush()
+        except OSError:
+            pass
+        after_failure = path.read_bytes()
+        monkeypatch.setattr(os, "fsync", real_fsync)
+        await store.flush()
+        return after_failure
+
+    after_failure = asyncio.run(run())
+
+    assert after_failure == b'{"role":"user","content":"a"}\n'
+
+    assert asyncio.run(ChatHistoryStore(path).load()) == [
+        {"role": "user", "content": "a"},
+        {"role": "assistant", "content": "b"},
+    ]
+
+
+def test_remove_where_also_filters_archives(tmp_path):
+    path = tmp_path / "chat_history.jsonl"
+    store = ChatHistoryStore(path, max_active=4)
+
+    async def run():
+        for i in range(5):
+            await store.append({"role": "user", "content": str(i), "profile": "x" if i % 2 else "y"})
+        removed = await store.remove_where(lambda m: m.get("profile") == "x")
+        archived = [m["content"] async for m in store.iter_archived()]
+        active = [m["content"] for m in await store.load()]
+        return removed, archived, active
+
+    removed, archived, active = asyncio.run(run())
+
+    assert removed == 2
+    assert archived == ["0", "2"]
+    assert active == ["4"]
+    assert len(store.archive_paths()) == 1
+    assert list(tmp_path.glob("*.tmp")) == []
+
+    assert asyncio.run(store.remove_where(lambda m: m.get("profile") == "y")) == 3
+    assert store.archive_paths() == []
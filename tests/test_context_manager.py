@@ -0,0 +1,20 @@
+import json
+import os
+
+from backend.mcp.context_manager import ContextManager
+
+
+def test_context_sets_are_cached_and_reloaded_on_change(tmp_path):
+    config = tmp_path / "context_sets.json"
+    config.write_text(json.dumps({"@bar": ["https://a", "@base"], "@base": {"urls": ["https://b"]}}), encoding="utf-8")
+    cm = ContextManager(config)
+
+    assert cm.get_all_set_urls() == {"@bar": ["https://a", "https://b"], "@base": ["https://b"]}
+    assert cm.get_set_urls("bar") == ["https://a", "https://b"]
+
+    config.write_text(json.dumps({"@bar": ["https://c"]}), encoding="utf-8")
+    st = config.stat()
+    os.utime(config, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert cm.get_available_sets() == ["@bar"]
+    assert cm.get_set_urls("@bar") == ["https://c"]
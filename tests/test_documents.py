@@ -56,6 +56,7 @@ def test_session_upload_apply_history_export_delete(temp_doc_paths):
     history_dir = documents.SESSIONS_PATH / session_id / "history"
     backups = list(history_dir.glob("state-*.docx"))
     assert len(backups) == 1
+    assert backups[0].read_bytes() == DOCX_BYTES_INITIAL
     assert state_path.read_bytes() == DOCX_BYTES_UPDATED
 
     # History listing shows one version
@@ -63,6 +64,9 @@ def test_session_upload_apply_history_export_delete(temp_doc_paths):
     assert history_resp.status_code == 200
     versions = history_resp.json().get("versions", [])
     assert len(versions) == 1
+    assert versions[0]["filename"] == backups[0].name
+    limited = client.get(f"/api/v1/documents/session/{session_id}/history", params={"limit": 0})
+    assert limited.json()["versions"] == []
 
     # Export returns updated bytes
     export_resp = client.get(f"/api/v1/documents/session/{session_id}/export")
@@ -73,3 +77,92 @@ def test_session_upload_apply_history_export_delete(temp_doc_paths):
     delete_resp = client.delete(f"/api/v1/documents/session/{session_id}")
     assert delete_resp.status_code == 200
     assert not (documents.SESSIONS_PATH / session_id).exists()
+
+
+def test_upload_over_size_limit_is_rejected(temp_doc_paths, monkeypatch):
+    monkeypatch.setattr(documents, "MAX_UPLOAD_BYTES", 4)
+    client = TestClient(app)
+
+    resp = client.post(
+        "/api/v1/documents",
+        files={"file": ("big.txt", io.BytesIO(b"0123456789"), "text/plain")},
+    )
+
+    assert resp.status_code == 413
+    assert list(documents.INPUT_DOCS_PATH.iterdir()) == []
+
+
+def test_google_import_and_export_stream_session_file(temp_doc_paths, monkeypatch):
+    import httpx
+    from backend.adapters import http as http_pool
+
+    def handler(request):
+        if request.method == "POST":
+            assert DOCX_BYTES_INITIAL in request.read()
+            return httpx.Response(200, json={"id": "drive-1"})
+        if "missing" in request.url.path:
+            return httpx.Response(404)
+        return httpx.Response(200, content=DOCX_BYTES_INITIAL)
+
+    monkeypatch.setitem(http_pool._clients, "google", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    client = TestClient(app)
+
+    resp = client.post("/api/v1/documents/google/import", json={"doc_id": "abc"})
+    assert resp.status_code == 200
+    session_dir = documents.SESSIONS_PATH / resp.json()["session_id"]
+    assert (session_dir / "state.docx").read_bytes() == DOCX_BYTES_INITIAL
+    assert not (session_dir / "state.docx.part").exists()
+
+    failed = client.post("/api/v1/documents/google/import", json={"doc_id": "missing"})
+    assert failed.status_code == 400
+    assert [p.name for p in documents.SESSIONS_PATH.iterdir()] == [session_dir.name]
+
+    export = client.post(f"/api/v1/documents/google/export/{session_dir.name}", json={"access_token": "t"})
+    assert export.status_code == 200
+    assert export.json()["file_id"] == "drive-1"
+    assert export.json()["name"] == "edited-gdoc-abc.docx"
+
+    batch = client.post("/api/v1/documents/google/import/batch", json={"doc_ids": ["abc", "missing", "abc"]})
+    assert batch.status_code == 200
+    assert len(batch.json()["sessions"]) == 1
+    assert batch.json()["errors"] == [{"doc_id": "missing", "status_code": 400, "detail": "Google Docs download failed (status 404)"}]
+
+
+def test_google_export_large_file_uses_resumable_chunks(temp_doc_paths, monkeypatch):
+    import httpx
+    from backend.adapters import http as http_pool
+
+    received = bytearray()
+    puts = []
+
+    def handler(request):
+        if request.url.params.get("uploadType") == "resumable":
+            assert request.headers["X-Upload-Content-Length"] == str(len(DOCX_BYTES_INITIAL))
+            return httpx.Response(200, headers={"Location": "https://upload.test/session-1"})
+        if request.method == "PUT":
+            content_range = request.headers["Content-Range"]
+            puts.append(content_range)
+            if content_range.startswith("bytes */"):
+                return httpx.Response(308, headers={"Range": f"bytes=0-{len(received) - 1}"})
+            if len(puts) == 2:
+                return httpx.Response(503)
+            received.extend(request.read())
+            if len(received) == len(DOCX_BYTES_INITIAL):
+                return httpx.Response(200, json={"id": "drive-big"})
+            return httpx.Response(308, headers={"Range": f"bytes=0-{len(received) - 1}"})
+        if request.method == "GET":
+            return httpx.Response(200, content=DOCX_BYTES_INITIAL)
+        raise AssertionError("multipart path must not be used")
+
+    monkeypatch.setattr(documents, "DRIVE_RESUMABLE_THRESHOLD", 4)
+    monkeypatch.setattr(documents, "DRIVE_UPLOAD_CHUNK_SIZE", 4)
+    monkeypatch.setitem(http_pool._clients, "google", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    client = TestClient(app)
+
+    session_id = client.post("/api/v1/documents/google/import", json={"doc_id": "big"}).json()["session_id"]
+    export = client.post(f"/api/v1/documents/google/export/{session_id}", json={"access_token": "t"})
+
+    assert export.status_code == 200
+    assert export.json()["file_id"] == "drive-big"
+    assert bytes(received) == DOCX_BYTES_INITIAL
+    assert puts[:3] == [f"bytes 0-3/{len(DOCX_BYTES_INITIAL)}", f"bytes 4-7/{len(DOCX_BYTES_INITIAL)}", f"bytes */{len(DOCX_BYTES_INITIAL)}"]
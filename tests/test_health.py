@@ -0,0 +1,32 @@
+import asyncio
+import threading
+import time
+
+from backend.api.v1 import health
+
+
+class SlowServerManager:
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def is_healthy(self) -> bool:
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.2)  # wie ein blockierender requests.get bei nicht erreichbarem Server
+        return False
+
+
+def test_concurrent_status_polls_share_one_health_probe(monkeypatch):
+    manager = SlowServerManager()
+    monkeypatch.setattr(health, "get_server_manager", lambda: manager)
+    monkeypatch.setattr(health, "_llm_health", (False, 0.0))
+    monkeypatch.setattr(health, "_llm_health_lock", asyncio.Lock())
+
+    async def run():
+        return await asyncio.gather(*(health.llm_server_healthy() for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert results == [False] * 5
+    assert manager.calls == 1
@@ -0,0 +1,31 @@
+import asyncio
+
+import httpx
+
+from backend.adapters.http import post_with_retry
+
+
+def make_client(statuses):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(statuses[min(len(calls), len(statuses)) - 1])
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), calls
+
+
+def test_post_with_retry_recovers_from_transient_5xx():
+    client, calls = make_client([503, 502, 200])
+    response = asyncio.run(post_with_retry(client, "http://test/chat", base_delay=0.01, max_delay=0.02))
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+
+
+def test_post_with_retry_does_not_retry_client_errors():
+    client, calls = make_client([429, 200])
+    response = asyncio.run(post_with_retry(client, "http://test/chat", base_delay=0.01))
+
+    assert response.status_code == 429
+    assert len(calls) == 1
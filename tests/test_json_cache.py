@@ -0,0 +1,17 @@
+import os
+
+from backend.core.json_cache import load_json
+
+
+def test_load_json_is_cached_until_file_changes(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text('{"a": 1}', encoding="utf-8")
+
+    first = load_json(path)
+    assert load_json(path) is first
+
+    path.write_text('{"a": 22}', encoding="utf-8")
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert load_json(path) == {"a": 22}
@@ -0,0 +1,23 @@
+import os
+
+from backend.core.persisted_selection import PersistedSelection
+
+
+def test_selection_default_set_and_external_change(tmp_path):
+    path = tmp_path / "current_profile.json"
+    store = PersistedSelection(path, "profile", default="general_chat")
+
+    assert store.get() == "general_chat"
+
+    store.set("coding")
+    assert store.get() == "coding"
+    assert PersistedSelection(path, "profile").get() == "coding"
+
+    # Änderung von außen wird über mtime/size erkannt
+    path.write_bytes(b'{"profile": "research_mode"}')
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert store.get() == "research_mode"
+
+    path.write_bytes(b"kein json")
+    assert store.get() == "general_chat"
@@ -0,0 +1,107 @@
+import asyncio
+import time
+
+from backend.adapters.base_provider import ChatMessage, ChatResponse, ProviderConfig
+from backend.adapters.mock_provider import MockProvider
+
+
+def mock_config() -> ProviderConfig:
+    return ProviderConfig(
+        name="mock",
+        display_name="Mock",
+        type="mock",
+        enabled=True,
+        description="Test provider",
+        base_url="http://mock",
+        requires_api_key=False,
+        features={},
+        rate_limits={},
+        cost={},
+    )
+
+
+class CountingMockProvider(MockProvider):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_checks = 0
+
+    async def _check_health(self) -> bool:
+        self.health_checks += 1
+        return True
+
+
+def test_is_healthy_is_cached_and_revalidated_in_background():
+    provider = CountingMockProvider(mock_config())
+
+    async def run():
+        assert await provider.is_healthy()
+        assert await provider.is_healthy()
+        assert provider.health_checks == 1
+
+        # Stale: old value is served immediately, refresh runs in background
+        healthy, checked_at = provider._health_cache
+        provider._health_cache = (healthy, checked_at - provider._health_ttl - 1)
+        assert await provider.is_healthy()
+        await provider._health_refresh
+        assert provider.health_checks == 2
+
+    asyncio.run(run())
+
+
+def test_chat_many_runs_concurrently_and_keeps_order():
+    provider = MockProvider(
+        mock_config(),
+        mock_responses={"a": "A", "b": "B"},
+        simulated_latency=0.2,
+    )
+    requests = [
+        {"messages": [ChatMessage(role="user", content=text)], "model": "mock-model"}
+        for text in ["a", "b", "a", "b"]
+    ]
+
+    start = time.monotonic()
+    results = asyncio.run(provider.chat_many(requests, concurrency=4))
+
+    assert time.monotonic() - start < 0.5
+    assert [r.content for r in results] == ["A", "B", "A", "B"]
+
+
+def test_cached_response_coalesces_and_reuses_identical_requests():
+    provider = MockProvider(mock_config())
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return ChatResponse(content="cached", model="mock-model", provider="mock")
+
+    payload = {"model": "mock-model", "messages": [ChatMessage(role="user", content="hi")]}
+
+    async def run():
+        burst = await asyncio.gather(*(provider._cached_response(payload, fetch) for _ in range(3)))
+        replay = await provider._cached_response(payload, fetch)
+        return burst, replay
+
+    burst, replay = asyncio.run(run())
+
+    assert calls == 1
+    assert [r.content for r in burst] == ["cached"] * 3
+    assert replay.metadata["cache_hit"] is True
+
+
+def test_model_index_is_built_once_even_for_empty_catalog():
+    class EmptyCatalogProvider(MockProvider):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.catalog_builds = 0
+
+        def get_models(self):
+            self.catalog_builds += 1
+            return []
+
+    provider = EmptyCatalogProvider(mock_config())
+
+    assert provider.get_model_info("missing") is None
+    assert provider.get_model_info("missing") is None
+    assert provider.catalog_builds == 1